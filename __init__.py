@@ -42,7 +42,11 @@ def draw_menu(self, items):
     if i < 10 and not title.startswith('('):
       title = f'({i}) {title}'
     if 'children' in item:
-      layout.menu(item['idname'], text=title)
+      if item.get('pending'):
+        # Registered by a timer, menu types can't be registered while drawing
+        layout.label(text=title, icon='TIME')
+      else:
+        layout.menu(item['idname'], text=title)
     elif item['title'] == '[Separator]':
       layout.separator()
       i -= 1
@@ -63,13 +67,33 @@ def draw_menu(self, items):
     elif 'menu' in item:
       layout.menu(item['menu'], text=title)
 
+def get_menu_children(menu_definition):
+  """Return a submenu's items, building included configs on first use."""
+  if 'include' in menu_definition:
+    path = menu_definition['include']
+    data = editor.load_included_config(path)
+    # The cache returns the same object until the file changes on disk
+    if menu_definition.get('source') is not data:
+      menu_definition['source'] = data
+      menu_definition['children'] = build_menu_items(data.get('items', []), path, deferred=True) if data else []
+  return menu_definition['children']
+
+# Menu definitions built while drawing, registered by register_pending_menus
+_pending_menu_types = []
+
+def register_pending_menus():
+  for menu_definition in _pending_menu_types:
+    register_menu_type(menu_definition)
+    del menu_definition['pending']
+  _pending_menu_types.clear()
+  return None
+
 def register_menu_type(menu_definition):
   title = menu_definition['title']
-  items = menu_definition['children']
   idname = menu_definition['idname']
 
   def draw(self, context):
-    draw_menu(self, items)
+    draw_menu(self, get_menu_children(menu_definition))
 
   menu_type = type(idname + "Menu", (bpy.types.Menu,), {
     'bl_idname': idname,
@@ -79,24 +103,45 @@ def register_menu_type(menu_definition):
 
   bpy.utils.register_class(menu_type)
 
-def build_menu_items(config_items):
+def build_menu_items(config_items, config_path, deferred=False):
   """Convert hierarchical config items to runtime menu items."""
   result = []
+
+  # Classes can't be registered from Menu.draw, deferred builds leave that to a timer
+  def add_menu(menu_def):
+    if deferred:
+      menu_def['pending'] = True
+      _pending_menu_types.append(menu_def)
+      if not bpy.app.timers.is_registered(register_pending_menus):
+        bpy.app.timers.register(register_pending_menus, first_interval=0)
+    else:
+      register_menu_type(menu_def)
+    result.append(menu_def)
+
   for item in config_items:
     item_type = item.get('type', 'operator')
     if item_type == 'separator':
       result.append({'title': '[Separator]'})
     elif item_type == 'group':
       name = item.get('name', '')
-      children = build_menu_items(item.get('children', []))
+      children = build_menu_items(item.get('children', []), config_path, deferred)
       idname = 'OBJECT_MT_Menu' + re.sub('[^A-Za-z0-9]+', '', name)
       menu_def = {
         'title': name,
         'children': children,
         'idname': idname,
       }
-      register_menu_type(menu_def)
-      result.append(menu_def)
+      add_menu(menu_def)
+    elif item_type == 'include':
+      # Included configs are read when their submenu is first drawn
+      name = item.get('name', '')
+      menu_def = {
+        'title': name,
+        'children': [],
+        'idname': 'OBJECT_MT_Menu' + re.sub('[^A-Za-z0-9]+', '', name),
+        'include': editor.resolve_include_path(config_path, item.get('path', '')),
+      }
+      add_menu(menu_def)
     elif item_type == 'menu':
       entry = {'title': item.get('name', ''), 'menu': item.get('menu', '')}
       if item.get('mode') and item['mode'] != 'ANY':
@@ -134,7 +179,7 @@ def load_items():
       if not 'items' in obj:
         raise Exception('No items in config')
 
-      app['items'].extend(build_menu_items(obj['items']))
+      app['items'].extend(build_menu_items(obj['items'], config_path))
     elif not os.path.exists(config_path):
       print(f'[QuickMenu] Config file not found: {config_path}')
 
@@ -228,6 +273,16 @@ class QuickMenuProperties(bpy.types.PropertyGroup):
   # Used to track the current vertex color index. This is used to generate unique
   # vertex colors for id maps in apps like Substance Painter
   vertex_color_index: bpy.props.IntProperty(name='Vertex Color Index', default=3)
+
+  # What happens to Quick Menu booleans while their cutters are being moved
+  boolean_preview: bpy.props.EnumProperty(name='Boolean Preview', items=(
+    ('OFF', 'Off', 'Always evaluate booleans with their own solver'),
+    ('FLOAT', 'Float Solver', 'Use the float solver while cutters are being moved'),
+    ('DISABLE', 'Disable', 'Hide booleans in the viewport while cutters are being moved')
+  ))
+
+  # Keep difference booleans whose cutters don't reach the target disabled
+  boolean_culling: bpy.props.BoolProperty(name='Boolean Culling', default=False)
  
 def register():
   bpy.utils.register_class(QuickMenu)
@@ -236,6 +291,10 @@ def register():
   bpy.utils.register_class(QuickMenuPreferences)
   bpy.utils.register_class(QuickMenuProperties)
 
+  # Before the handlers of the operator modules, which read data versions
+  bpy.app.handlers.depsgraph_update_post.append(clear_state_cache)
+  bpy.app.handlers.depsgraph_update_post.append(track_data_versions)
+
   editor.register()
 
   general.register()
@@ -293,5 +352,12 @@ def unregister():
 
   del bpy.types.Scene.quick_menu
   unregister_hotkey()
+  if bpy.app.timers.is_registered(register_pending_menus):
+    bpy.app.timers.unregister(register_pending_menus)
+  _pending_menu_types.clear()
   if _on_load_post in bpy.app.handlers.load_post:
     bpy.app.handlers.load_post.remove(_on_load_post)
+  if clear_state_cache in bpy.app.handlers.depsgraph_update_post:
+    bpy.app.handlers.depsgraph_update_post.remove(clear_state_cache)
+  if track_data_versions in bpy.app.handlers.depsgraph_update_post:
+    bpy.app.handlers.depsgraph_update_post.remove(track_data_versions)
@@ -0,0 +1,56 @@
+# Per-object operators on many selected objects: select() loops vs batch_execute.
+import bpy, os, sys
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+from utils import *
+
+COUNTS = (10, 100, 1000)
+
+def make_cubes(count):
+  clear_scene()
+  mesh = bpy.data.meshes.new('Cube')
+  mesh.from_pydata([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)], [], [
+    (0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)
+  ])
+  objects = []
+  for i in range(count):
+    obj = bpy.data.objects.new(f'Cube{i}', mesh.copy())
+    obj.location = (i * 2, 0, 0)
+    bpy.context.collection.objects.link(obj)
+    objects.append(obj)
+  for obj in objects: obj.select_set(True)
+  bpy.context.view_layer.objects.active = objects[0]
+  return objects
+
+def remove_collisions(objects):
+  for obj in objects:
+    for m in [m for m in obj.modifiers if m.type == 'COLLISION']:
+      obj.modifiers.remove(m)
+
+def main():
+  addon = load_addon()
+  common = addon.common.common
+  addon.operators.animation.register()
+  rows = []
+  try:
+    with bpy.context.temp_override(**view3d_override()):
+      for count in COUNTS:
+        objects = make_cubes(count)
+
+        def legacy():
+          for obj in objects:
+            common.select(obj)
+            common.add_or_get_modifier('QMCollision', 'COLLISION')
+          for obj in objects: obj.select_set(True)
+          remove_collisions(objects)
+
+        def batched():
+          bpy.ops.qm.add_collision()
+          remove_collisions(objects)
+
+        rows.append((count, measure(legacy, repeat=1 if count >= 1000 else 3), measure(batched, repeat=3)))
+  finally:
+    addon.operators.animation.unregister()
+
+  report('Add Collision on selected objects (best of N, ms)', ('objects', 'select loop', 'batch'), rows)
+
+main()
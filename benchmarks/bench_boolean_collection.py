@@ -0,0 +1,48 @@
+# Evaluating a dense target cut by many cutters: a boolean modifier per cutter
+# vs one boolean modifier with a collection operand.
+import bpy, os, sys
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+from utils import *
+
+CUTTER_COUNTS = (10, 50)
+SUBDIVISIONS = 6
+
+def make_scene(cutter_count):
+  clear_scene()
+  for collection in list(bpy.data.collections):
+    bpy.data.collections.remove(collection)
+  bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=SUBDIVISIONS, radius=2)
+  target = bpy.context.object
+  cutters = []
+  for i in range(cutter_count):
+    bpy.ops.mesh.primitive_cube_add(size=0.3, location=(2 * ((i * 0.618) % 1) - 1, 2 * ((i * 0.382) % 1) - 1, 1.8))
+    cutters.append(bpy.context.object)
+  bpy.ops.object.select_all(action='DESELECT')
+  for cutter in cutters: cutter.select_set(True)
+  target.select_set(True)
+  bpy.context.view_layer.objects.active = target
+  return target
+
+def evaluate(target):
+  target.update_tag()
+  bpy.context.view_layer.update()
+
+def main():
+  addon = load_addon()
+  addon.operators.cut.register()
+  rows = []
+  try:
+    with bpy.context.temp_override(**view3d_override()):
+      for count in CUTTER_COUNTS:
+        timings = []
+        for use_collection in (False, True):
+          target = make_scene(count)
+          bpy.ops.qm.boolean(operation='DIFFERENCE', solver='EXACT', boundary_extend=0, use_collection=use_collection)
+          timings.append(measure(lambda: evaluate(target), repeat=3))
+        rows.append((count, len(target.data.polygons), *timings))
+  finally:
+    addon.operators.cut.unregister()
+
+  report('Boolean evaluation of a dense target (best of 3, ms)', ('cutters', 'faces', 'per cutter', 'collection'), rows)
+
+main()
@@ -0,0 +1,46 @@
+# Cursor to selected in mesh edit mode: snap operator vs analytic center, for
+# everything selected and for a small selection.
+import bpy, bmesh, os, sys
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+from utils import *
+
+SUBDIVISIONS = (100, 500, 1000)
+
+# Vertices selected in the small selection case
+SMALL_SELECTION = 100
+
+def select_some(obj, count):
+  bpy.ops.mesh.select_all(action='DESELECT')
+  bm = bmesh.from_edit_mesh(obj.data)
+  bm.verts.ensure_lookup_table()
+  step = len(bm.verts) // count
+  for i in range(count):
+    bm.verts[i * step].select = True
+  bm.select_flush_mode()
+  bmesh.update_edit_mesh(obj.data)
+
+def main():
+  common = load_addon().common.common
+  rows = []
+  with bpy.context.temp_override(**view3d_override()):
+    for subdivisions in SUBDIVISIONS:
+      clear_scene()
+      obj = make_grid_object('Grid', subdivisions)
+      bpy.ops.object.mode_set(mode='EDIT')
+      for selection in ('all', SMALL_SELECTION):
+        if selection == 'all':
+          bpy.ops.mesh.select_all(action='SELECT')
+        else:
+          select_some(obj, selection)
+        rows.append((
+          len(obj.data.vertices),
+          selection,
+          measure(lambda: common.cursor_to_selected_with_operator(), repeat=3),
+          measure(lambda: common.selection_center(), repeat=3),
+          measure(lambda: common.cursor_to_selected(), repeat=3),
+        ))
+      bpy.ops.object.mode_set(mode='OBJECT')
+
+  report('Cursor to selected (best of N, ms)', ('vertices', 'selected', 'operator', 'analytic', 'cursor_to_sel'), rows)
+
+main()
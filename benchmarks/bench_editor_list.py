@@ -0,0 +1,67 @@
+# Editor item list latency on synthetic configs of increasing size.
+import bpy, json, os, sys, tempfile
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+from utils import *
+
+SIZES = (1000, 10000, 50000)
+MODES = ('OBJECT', 'EDIT_MESH', 'SCULPT')
+QUERIES = ('select', 'qm.', 'zzz')
+
+def synthetic_config(size, group_size=50):
+  groups = []
+  for g in range(size // group_size):
+    children = []
+    for i in range(group_size):
+      item = {'type': 'operator', 'name': f'Item {g}-{i}', 'operator': f'mesh.select_{i % 7}'}
+      if i % 3 == 0:
+        item['mode'] = MODES[i % len(MODES)]
+      children.append(item)
+    groups.append({'type': 'group', 'name': f'Group {g}', 'children': children})
+  return {'items': groups}
+
+def main():
+  editor = load_addon().editor
+  editor.register()
+  scene = bpy.context.scene
+  rows = []
+  try:
+    for size in SIZES:
+      with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(synthetic_config(size), f)
+        path = f.name
+
+      def build_index():
+        editor._index.clear()
+        editor._mode_positions.clear()
+        editor._filter_cache.clear()
+        data = editor._load_config(path)
+        editor._index_items(path, data['items'], 0, '', [])
+
+      def filter_all():
+        for text in QUERIES:
+          editor._filter_cache.clear()
+          editor._filter_positions(text, 'ANY')
+        editor._filter_cache.clear()
+        editor._filter_positions('', 'EDIT_MESH')
+
+      def expand_all_and_draw():
+        editor._expanded_groups.update(r['group_path'] for r in editor._index if r['is_group'])
+        editor._update_visible(scene)
+        editor._materialize_window(scene)
+        editor._expanded_groups.clear()
+
+      index_ms = measure(build_index, repeat=3)
+      filter_ms = measure(filter_all) / (len(QUERIES) + 1)
+      window_ms = measure(expand_all_and_draw)
+      rows.append((size, index_ms, filter_ms, window_ms, len(scene.qm_item_list)))
+      os.remove(path)
+  finally:
+    editor.unregister()
+
+  report(
+    'Editor item list (best of N, ms)',
+    ('items', 'parse+index', 'filter', 'expand+window', 'rows drawn'),
+    rows
+  )
+
+main()
@@ -0,0 +1,54 @@
+# Edit mode selection/visibility queries used by menu polls on dense meshes.
+import bpy, bmesh, os, sys
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+from utils import *
+
+SUBDIVISIONS = (300, 1000, 1500)
+
+def legacy_anything_is_selected():
+  for o in bpy.context.objects_in_mode:
+    if True in [v.select for v in bmesh.from_edit_mesh(o.data).verts]:
+      return True
+  return False
+
+def legacy_anything_is_hidden():
+  for o in bpy.context.objects_in_mode:
+    if True in [v.hide for v in bmesh.from_edit_mesh(o.data).verts]:
+      return True
+  return False
+
+def main():
+  common = load_addon().common.common
+  rows = []
+  with bpy.context.temp_override(**view3d_override()):
+    for subdivisions in SUBDIVISIONS:
+      clear_scene()
+      obj = make_grid_object('Grid', subdivisions)
+      bpy.ops.object.mode_set(mode='EDIT')
+      bpy.ops.mesh.select_all(action='DESELECT')
+
+      def cold_selected():
+        common.clear_state_cache()
+        common.anything_is_selected_in_editmode()
+
+      def cold_hidden():
+        common.clear_state_cache()
+        common.anything_is_hidden_in_editmode()
+
+      rows.append((
+        len(obj.data.vertices),
+        measure(legacy_anything_is_selected, repeat=3),
+        measure(cold_selected),
+        measure(legacy_anything_is_hidden, repeat=3),
+        measure(cold_hidden, repeat=3),
+        measure(common.anything_is_hidden_in_editmode),
+      ))
+      bpy.ops.object.mode_set(mode='OBJECT')
+
+  report(
+    'Edit mode state queries, nothing selected or hidden (best of N, ms)',
+    ('vertices', 'legacy sel', 'selected', 'legacy hidden', 'hidden cold', 'hidden memo'),
+    rows
+  )
+
+main()
@@ -0,0 +1,54 @@
+# Shared helpers for the benchmark scripts. Run a benchmark with:
+#   blender --background --factory-startup --python benchmarks/<script>.py
+import bpy, importlib.util, os, sys, time
+
+repository_directory = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+def load_addon():
+  """Import the addon package from this checkout without installing it."""
+  if 'quickmenu' in sys.modules:
+    return sys.modules['quickmenu']
+  spec = importlib.util.spec_from_file_location(
+    'quickmenu',
+    os.path.join(repository_directory, '__init__.py'),
+    submodule_search_locations=[repository_directory]
+  )
+  module = importlib.util.module_from_spec(spec)
+  sys.modules['quickmenu'] = module
+  spec.loader.exec_module(module)
+  return module
+
+def measure(fn, repeat=5):
+  """Run fn several times and return the best wall time in milliseconds."""
+  best = float('inf')
+  for _ in range(repeat):
+    start = time.perf_counter()
+    fn()
+    best = min(best, time.perf_counter() - start)
+  return best * 1000
+
+def report(title, header, rows):
+  print(f'\n{title}')
+  print(' | '.join(f'{h:>14}' for h in header))
+  for row in rows:
+    print(' | '.join(f'{v:>14.3f}' if isinstance(v, float) else f'{v:>14}' for v in row))
+
+def clear_scene():
+  for obj in list(bpy.data.objects):
+    bpy.data.objects.remove(obj)
+  for mesh in list(bpy.data.meshes):
+    bpy.data.meshes.remove(mesh)
+
+def make_grid_object(name, subdivisions, size=2):
+  """Add a grid mesh object with roughly subdivisions^2 vertices and make it active."""
+  bpy.ops.mesh.primitive_grid_add(x_subdivisions=subdivisions, y_subdivisions=subdivisions, size=size)
+  obj = bpy.context.object
+  obj.name = name
+  return obj
+
+def view3d_override():
+  """Context override for the first 3D viewport, for operators and screen context members."""
+  window = bpy.context.window_manager.windows[0]
+  area = next(a for a in window.screen.areas if a.type == 'VIEW_3D')
+  region = next(r for r in area.regions if r.type == 'WINDOW')
+  return {'window': window, 'screen': window.screen, 'area': area, 'region': region}
@@ -1,4 +1,5 @@
 import bpy, bmesh
+import numpy as np
 from mathutils import Vector, Matrix
 
 def is_in_editmode():
@@ -9,22 +10,250 @@ def select(obj):
   obj.select_set(True)
   bpy.context.view_layer.objects.active = obj
 
+def objects_override(objects, active=None):
+  # Context override that makes operators see objects as the selection,
+  # without actually selecting anything
+  objects = list(objects)
+  active = active if active is not None else (objects[0] if objects else None)
+  return bpy.context.temp_override(
+    object=active,
+    active_object=active,
+    selected_objects=objects,
+    selected_editable_objects=objects
+  )
+
+def window_override(**kwargs):
+  # Context override with a window and a 3D view, for running operators from
+  # timers and handlers that have no window in their context
+  for window in bpy.context.window_manager.windows:
+    for area in window.screen.areas:
+      if area.type == 'VIEW_3D':
+        region = next(r for r in area.regions if r.type == 'WINDOW')
+        return bpy.context.temp_override(window=window, screen=window.screen, area=area, region=region, **kwargs)
+  return bpy.context.temp_override(**kwargs)
+
+def batch_execute(objects, callback):
+  # Run callback(obj) with each object as the context object instead of selecting
+  # them one by one, then restore the selection and evaluate the depsgraph once
+  objects = list(objects)
+  view_layer = bpy.context.view_layer
+  active = view_layer.objects.active
+  selected = [o for o in view_layer.objects if o.select_get()]
+  results = []
+  for obj in objects:
+    with objects_override([obj]):
+      results.append(callback(obj))
+  for obj in selected:
+    if not obj.select_get(): obj.select_set(True)
+  view_layer.objects.active = active
+  view_layer.update()
+  return results
+
 def get_selected_non_active():
   objects = [o for o in bpy.context.selected_objects if o != bpy.context.object]
   return objects[0] if len(objects) == 1 else None
 
-def get_selection_and_active_indices():
-  selected_indeces = []
-  active_indeces = []
-  mesh = bpy.context.active_object.data
-  bm = bmesh.from_edit_mesh(mesh)
-  if not mesh.vertex_colors: mesh.vertex_colors.new()
-  for face in [face for face in bm.faces if face.select]:
-    for loop in face.loops:
-      selected_indeces.append(loop.index)
-      if face == bm.faces.active: active_indeces.append(loop.index)
+def face_loop_indices(starts, totals, faces):
+  # Concatenated loop indices of the given faces
+  starts, totals = starts[faces], totals[faces]
+  return np.repeat(starts - np.cumsum(totals) + totals, totals) + np.arange(totals.sum())
+
+def polygon_areas(corners, starts, totals):
+  # Area of every polygon from its 2D or 3D corner coordinates in loop order,
+  # as the length of the summed cross products of a triangle fan
+  if corners.shape[1] == 2:
+    corners = np.column_stack((corners, np.zeros(len(corners))))
+  first = np.repeat(corners[starts], totals, axis=0)
+  next_loops = np.arange(len(corners)) + 1
+  next_loops[starts + totals - 1] = starts
+  crosses = np.cross(corners - first, corners[next_loops] - first)
+  return np.linalg.norm(np.add.reduceat(crosses, starts), axis=1) / 2 if len(starts) else np.empty(0)
+
+def face_adjacency(access, blocked_edges = None):
+  # Pairs of faces sharing an edge, found by sorting loops by edge index
+  totals = access.loop_totals()
+  loop_faces = np.repeat(np.arange(len(totals)), totals)
+  loop_edges = access.loop_edges()
+  order = np.argsort(loop_edges, kind='stable')
+  edges, faces = loop_edges[order], loop_faces[order]
+  shared = edges[1:] == edges[:-1]
+  a, b = faces[:-1][shared], faces[1:][shared]
+  if blocked_edges is not None:
+    keep = ~blocked_edges[edges[1:][shared]]
+    a, b = a[keep], b[keep]
+  return a, b
+
+def connected_components(count, a, b):
+  # Component label (0..n-1) of every node of an undirected graph given as edge
+  # arrays, with a vectorized union-find: hook roots to the smaller root of each
+  # edge, then compress paths by pointer jumping until every edge is inside a set
+  parent = np.arange(count)
+  while len(a):
+    root_a, root_b = parent[a], parent[b]
+    differ = root_a != root_b
+    if not differ.any(): break
+    root_a, root_b = root_a[differ], root_b[differ]
+    low = np.minimum(root_a, root_b)
+    np.minimum.at(parent, root_a, low)
+    np.minimum.at(parent, root_b, low)
+    while True:
+      grandparent = parent[parent]
+      if np.array_equal(grandparent, parent): break
+      parent = grandparent
+  return np.unique(parent, return_inverse=True)[1]
+
+def mesh_islands(access, faces, delimit_seams = False, delimit_material = False):
+  # Island label of each of the given faces, connected through shared edges
+  blocked = access.edge_seams() if delimit_seams else None
+  a, b = face_adjacency(access, blocked)
+  in_scope = np.zeros(len(access.loop_totals()), dtype=bool)
+  in_scope[faces] = True
+  keep = in_scope[a] & in_scope[b]
+  if delimit_material:
+    materials = access.face_materials()
+    keep &= materials[a] == materials[b]
+  labels = connected_components(len(in_scope), a[keep], b[keep])
+  return np.unique(labels[faces], return_inverse=True)[1]
+
+# UV coordinates closer than this are treated as the same point
+UV_MERGE_DISTANCE = 1e-5
+
+def uv_islands(access, faces, uvs):
+  # Island label of each of the given faces, connected through corners that share
+  # both the vertex and the UV coordinates. Faces and corners are nodes of one graph
+  if len(faces) == 0:
+    return np.empty(0, dtype=np.int64)
+  starts, totals = access.loop_starts(), access.loop_totals()
+  loops = face_loop_indices(starts, totals, faces)
+  loop_faces = np.repeat(np.arange(len(faces)), totals[faces])
+  snapped = np.round(uvs[loops] / UV_MERGE_DISTANCE).astype(np.int64)
+  corners = np.column_stack((access.loop_vertices()[loops], snapped))
+  corner_ids = np.unique(corners, axis=0, return_inverse=True)[1].ravel()
+  labels = connected_components(len(faces) + corner_ids.max() + 1, loop_faces, len(faces) + corner_ids)
+  return np.unique(labels[:len(faces)], return_inverse=True)[1]
+
+def quad_edge_lengths(access, quad_loops, mode):
+  # Length of every edge used to space UVs when following quads
+  edge_vertices = access.edge_vertices()
+  if mode == 'EVEN':
+    return np.ones(len(edge_vertices))
+  positions = access.vertex_positions()
+  lengths = np.linalg.norm(positions[edge_vertices[:, 0]] - positions[edge_vertices[:, 1]], axis=1)
+  if mode == 'LENGTH_AVERAGE':
+    # Edges facing each other across a quad belong to the same edge ring
+    quad_edges = access.loop_edges()[quad_loops]
+    rings = connected_components(len(lengths), quad_edges[:, :2].ravel(), quad_edges[:, 2:].ravel())
+    lengths = (np.bincount(rings, lengths) / np.bincount(rings))[rings]
+  return lengths
+
+def straighten_quads(uvs):
+  # Snap the corners of every quad (an n x 4 x 2 array) to an axis aligned rectangle.
+  # Corners are ordered by angle around the center, the first edge snaps to the axis
+  # it's closest to and the following ones alternate
+  rows = np.arange(len(uvs))[:, None]
+  centered = uvs - uvs.mean(axis=1, keepdims=True)
+  angles = np.arctan2(centered[..., 1], centered[..., 0])
+  order = np.argsort(angles % (2 * np.pi), axis=1)
+  corners = uvs[rows, order]
+  first_axis = np.argmin(np.abs(corners[:, 1] - corners[:, 0]), axis=1)
+  rows = rows.ravel()
+  for step in range(1, 5):
+    axis = (first_axis + step - 1) % 2
+    corners[rows, step % 4, axis] = corners[rows, step - 1, axis]
+  straightened = np.empty_like(uvs)
+  straightened[rows[:, None], order] = corners
+  return straightened
+
+def follow_quads(access, uvs, quads, references, edge_length_mode = 'LENGTH_AVERAGE'):
+  # Lay quads out as a grid of rectangles continuing the reference quads across
+  # edges that aren't UV seams, one ring of neighbours at a time for all of the
+  # references at once. Returns the loop indices of the placed quads and their UVs.
+  # Quads are addressed by position p = quad * 4 + corner, corner c starts edge c
+  quad_loops = access.loop_starts()[quads][:, None] + np.arange(4)
+  loop_vertices, loop_edges = access.loop_vertices(), access.loop_edges()
+  vertices = loop_vertices[quad_loops]
+  lengths = quad_edge_lengths(access, quad_loops, edge_length_mode)[loop_edges[quad_loops]]
+  grid = uvs[quad_loops].astype(np.float64)
+  grid[references] = straighten_quads(grid[references])
+
+  # Twin of every position: the position of the neighbouring quad on the same
+  # manifold edge, as long as both ends of the edge share UVs
+  edges = loop_edges[quad_loops].ravel()
+  _, inverse, counts = np.unique(edges, return_inverse=True, return_counts=True)
+  manifold = np.flatnonzero(counts[inverse.ravel()] == 2)
+  manifold = manifold[np.argsort(edges[manifold], kind='stable')]
+  a, b = manifold[0::2], manifold[1::2]
+  flat_uvs, flat_vertices = uvs[quad_loops].reshape(-1, 2), vertices.ravel()
+  next_position = lambda p: p - p % 4 + (p + 1) % 4
+  same_direction = flat_vertices[a] == flat_vertices[b]
+  b_start = np.where(same_direction, b, next_position(b))
+  b_end = np.where(same_direction, next_position(b), b)
+  connected = (
+    (np.abs(flat_uvs[a] - flat_uvs[b_start]).max(axis=1) < UV_MERGE_DISTANCE) &
+    (np.abs(flat_uvs[next_position(a)] - flat_uvs[b_end]).max(axis=1) < UV_MERGE_DISTANCE)
+  )
+  twins = np.full(len(edges), -1)
+  twins[a[connected]], twins[b[connected]] = b[connected], a[connected]
+
+  placed = np.zeros(len(quads), dtype=bool)
+  placed[references] = True
+  frontier = np.asarray(references)
+  while len(frontier):
+    positions = (frontier[:, None] * 4 + np.arange(4)).ravel()
+    neighbours = twins[positions]
+    keep = neighbours >= 0
+    positions, neighbours = positions[keep], neighbours[keep]
+    keep = ~placed[neighbours // 4]
+    positions, neighbours = positions[keep], neighbours[keep]
+    frontier, first = np.unique(neighbours // 4, return_index=True)
+    q, i = positions[first] // 4, positions[first] % 4
+    n, j = frontier, neighbours[first] % 4
+
+    # Both shared corners of the new quad copy the corner they're at in the placed
+    # quad, the far corners continue the placed quad's side edges, scaled by length
+    for corner, far, edge in ((j, (j + 3) % 4, (j + 3) % 4), ((j + 1) % 4, (j + 2) % 4, (j + 1) % 4)):
+      source = np.where(vertices[n, corner] == vertices[q, i], i, (i + 1) % 4)
+      opposite = np.where(source == i, (i + 3) % 4, (i + 2) % 4)
+      source_edge = np.where(opposite == (source + 3) % 4, opposite, source)
+      source_lengths = lengths[q, source_edge]
+      ratio = np.divide(lengths[n, edge], source_lengths, out=np.ones(len(n)), where=source_lengths > 0)
+      grid[n, corner] = grid[q, source]
+      grid[n, far] = grid[q, source] + (grid[q, source] - grid[q, opposite]) * ratio[:, None]
+    placed[frontier] = True
+
+  return quad_loops[placed].ravel(), grid[placed].reshape(-1, 2)
+
+def ensure_color_attribute(mesh):
+  attributes = mesh.color_attributes
+  if attributes.active_color is None:
+    attributes.active_color = attributes[0] if len(attributes) else attributes.new('Color', 'BYTE_COLOR', 'CORNER')
+  return attributes.active_color
+
+def selected_and_active_loops(access):
+  # Loop index arrays of the selected faces and of the active face (if it's selected)
+  selected_faces = access.face_selection()
+  starts, totals = access.loop_starts(), access.loop_totals()
+  selected_indeces = np.flatnonzero(np.repeat(selected_faces, totals))
+  active = access.active_face_index()
+  if 0 <= active < len(selected_faces) and selected_faces[active]:
+    active_indeces = np.arange(starts[active], starts[active] + totals[active])
+  else:
+    active_indeces = np.empty(0, dtype=np.int64)
   return (selected_indeces, active_indeces)
 
+def get_selection_and_active_indices(obj = None):
+  obj = obj or bpy.context.active_object
+  with MeshAccess(obj) as access:
+    return selected_and_active_loops(access)
+
+def get_selection_and_active_indices_in_mode():
+  # Same as above for every mesh in edit mode, keyed by object
+  return {
+    obj: get_selection_and_active_indices(obj)
+    for obj in bpy.context.objects_in_mode
+    if obj.type == 'MESH'
+  }
+
 def grid_snap(grid, value):
   return round(value / grid) * grid
 
@@ -53,18 +282,77 @@ def axis_by_vector(vector):
     elif vector[i] == -1:
       return axes[i], True
 
+def world_positions(obj, positions):
+  matrix = np.array(obj.matrix_world, dtype=np.float32)
+  return positions @ matrix[:3, :3].T + matrix[:3, 3]
+
+def selection_center():
+  # Bounding box center of selected vertices in mesh edit mode or of the selected
+  # objects' origins in object mode, like snap_cursor_to_selected computes it
+  context = bpy.context
+  if context.mode == 'EDIT_MESH':
+    points = []
+    for obj in context.objects_in_mode:
+      if obj.type != 'MESH' or obj.data.total_vert_sel == 0: continue
+      with MeshAccess(obj) as access:
+        points.append(world_positions(obj, access.selected_vertex_positions()))
+  else:
+    points = [np.array([o.matrix_world.translation for o in context.selected_objects], dtype=np.float32).reshape(-1, 3)]
+  points = np.concatenate(points) if points else np.empty((0, 3))
+  if len(points) == 0: return None
+  return Vector(((points.min(axis=0) + points.max(axis=0)) / 2).tolist())
+
+def active_element_location():
+  # Location of the active vertex, edge or face in mesh edit mode or of the active object
+  context = bpy.context
+  obj = context.object
+  if obj is None: return None
+  if context.mode != 'EDIT_MESH':
+    return obj.matrix_world.translation.copy()
+  bm = bmesh.from_edit_mesh(obj.data)
+  # Like snap_cursor_to_active, the active face stands in for an empty select history
+  element = bm.select_history.active or bm.faces.active
+  if isinstance(element, bmesh.types.BMVert):
+    local = element.co
+  elif isinstance(element, bmesh.types.BMEdge):
+    local = (element.verts[0].co + element.verts[1].co) / 2
+  elif isinstance(element, bmesh.types.BMFace):
+    local = element.calc_center_median()
+  else: return None
+  return obj.matrix_world @ local
+
+def view3d_area():
+  # The current area if it's a 3D viewport, else the first one on the screen
+  context = bpy.context
+  if context.area and context.area.type == 'VIEW_3D':
+    return context.area
+  return next((a for a in context.screen.areas if a.type == 'VIEW_3D'), None) if context.screen else None
+
 def cursor_to_selected(to_active = False):
+  mode = bpy.context.mode
+  # The snap operator walks a dense edit mesh in C, faster than any read from Python
+  if mode not in {'OBJECT', 'EDIT_MESH'} or (mode == 'EDIT_MESH' and not to_active and view3d_area()):
+    cursor_to_selected_with_operator(to_active)
+    return
+  location = active_element_location() if to_active else selection_center()
+  if location is not None:
+    bpy.context.scene.cursor.location = location
+
+def cursor_to_selected_with_operator(to_active = False):
+  # Runs in a 3D viewport through a context override instead of switching the
+  # current area's type
+  area = view3d_area()
+  if area is None: return
   ts = bpy.context.scene.tool_settings
-  previous_context = bpy.context.area.type
-  bpy.context.area.type = 'VIEW_3D'
   previous_pivot = ts.transform_pivot_point
   ts.transform_pivot_point = 'BOUNDING_BOX_CENTER'
-  if to_active:
-    bpy.ops.view3d.snap_cursor_to_active()
-  else:
-    bpy.ops.view3d.snap_cursor_to_selected()
+  region = next(r for r in area.regions if r.type == 'WINDOW')
+  with bpy.context.temp_override(area=area, region=region):
+    if to_active:
+      bpy.ops.view3d.snap_cursor_to_active()
+    else:
+      bpy.ops.view3d.snap_cursor_to_selected()
   ts.transform_pivot_point = previous_pivot
-  bpy.context.area.type = previous_context
 
 def execute_in_mode(mode, callback, *args):
   previous_mode = 'EDIT' if is_in_editmode() else bpy.context.mode
@@ -80,50 +368,411 @@ def execute_in_object_mode(callback, *args):
 def execute_in_edit_mode(callback, *args):
   return execute_in_mode('EDIT', callback, *args)
 
+class MeshAccess:
+  # Reads and writes mesh data of an object in bulk without switching modes.
+  # In object mode everything goes through foreach_get/foreach_set on the mesh.
+  # In edit mode reads come from a snapshot the edit BMesh is copied into
+  # (attribute data of an edit mesh can't be read through the mesh itself),
+  # and writes go through BMesh layers for the touched elements only.
+  # Element order of the snapshot matches the BMesh, so indices are shared.
+  # Byte color values are sRGB encoded like BMesh layers, float colors are linear.
+
+  def __init__(self, obj):
+    self.obj = obj
+    self.mesh = obj.data
+    self.bm = bmesh.from_edit_mesh(obj.data) if obj.mode == 'EDIT' else None
+    self._snapshot = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.release()
+
+  def release(self):
+    if self._snapshot is not None:
+      bpy.data.meshes.remove(self._snapshot)
+      self._snapshot = None
+
+  @property
+  def is_edit(self):
+    return self.bm is not None
+
+  @property
+  def source(self):
+    if self.bm is None:
+      return self.mesh
+    if self._snapshot is None:
+      self._snapshot = bpy.data.meshes.new('QMAccessSnapshot')
+      self.bm.to_mesh(self._snapshot)
+    return self._snapshot
+
+  def _changed(self):
+    # Edit mode writes invalidate the snapshot
+    bump_data_version(self.mesh)
+    if self.bm is not None:
+      self.release()
+      bmesh.update_edit_mesh(self.mesh, loop_triangles=False, destructive=False)
+    else:
+      self.mesh.update()
+
+  def _flags(self, bm_elements, mesh_elements, attribute):
+    # Edit mode flags come straight from the BMesh unless there's a snapshot anyway
+    if self.bm is not None and self._snapshot is None:
+      elements = getattr(self.bm, bm_elements)
+      return np.fromiter((getattr(e, attribute) for e in elements), bool, len(elements))
+    return self._get(getattr(self.source, mesh_elements), attribute, bool)
+
+  def _get(self, collection, attribute, dtype, width=1):
+    values = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attribute, values)
+    return values.reshape(-1, width) if width > 1 else values
+
+  def _set(self, collection, attribute, dtype, width, values, indices):
+    if indices is None:
+      data = values
+    else:
+      data = self._get(collection, attribute, dtype, width)
+      data[indices] = values
+    collection.foreach_set(attribute, np.ascontiguousarray(data, dtype=dtype).ravel())
+
+  def _pairs(self, values, indices):
+    values = np.asarray(values).tolist()
+    return enumerate(values) if indices is None else zip(np.asarray(indices).tolist(), values)
+
+  def _bm_loops(self, indices):
+    # BMesh loops by mesh loop index
+    starts = self.loop_starts()
+    indices = np.arange(len(self.source.loops)) if indices is None else np.asarray(indices)
+    faces = np.searchsorted(starts, indices, side='right') - 1
+    corners = indices - starts[faces]
+    self.bm.faces.ensure_lookup_table()
+    bm_faces = self.bm.faces
+    loops = []
+    current_face = face_loops = None
+    for f, c in zip(faces.tolist(), corners.tolist()):
+      if f != current_face:
+        current_face, face_loops = f, bm_faces[f].loops[:]
+      loops.append(face_loops[c])
+    return loops
+
+  # Topology
+
+  def loop_starts(self):
+    return self._get(self.source.polygons, 'loop_start', np.int32)
+
+  def loop_totals(self):
+    return self._get(self.source.polygons, 'loop_total', np.int32)
+
+  def loop_vertices(self):
+    return self._get(self.source.loops, 'vertex_index', np.int32)
+
+  def loop_edges(self):
+    return self._get(self.source.loops, 'edge_index', np.int32)
+
+  def edge_vertices(self):
+    return self._get(self.source.edges, 'vertices', np.int32, 2)
+
+  def edge_seams(self):
+    return self._get(self.source.edges, 'use_seam', bool)
+
+  def face_materials(self):
+    return self._get(self.source.polygons, 'material_index', np.int32)
+
+  # Selection
+
+  def vertex_selection(self):
+    return self._flags('verts', 'vertices', 'select')
+
+  def edge_selection(self):
+    return self._flags('edges', 'edges', 'select')
+
+  def face_selection(self):
+    return self._flags('faces', 'polygons', 'select')
+
+  def face_hidden(self):
+    return self._flags('faces', 'polygons', 'hide')
+
+  def active_face_index(self):
+    if self.bm is not None:
+      face = self.bm.faces.active
+      if face is None:
+        return -1
+      self.bm.faces.index_update()
+      return face.index
+    return self.mesh.polygons.active
+
+  def set_face_selection(self, selected):
+    # Vertices and edges follow the faces, like selecting faces in face select mode
+    selected = np.asarray(selected, dtype=bool)
+    loop_selected = np.repeat(selected, self.loop_totals())
+    vertices = np.zeros(len(self.source.vertices), dtype=bool)
+    vertices[self.loop_vertices()[loop_selected]] = True
+    edges = np.zeros(len(self.source.edges), dtype=bool)
+    edges[self.loop_edges()[loop_selected]] = True
+    self.set_selection(vertices, edges, selected)
+
+  def set_selection(self, vertices, edges, faces):
+    if self.bm is not None:
+      for elements, mask in ((self.bm.verts, vertices), (self.bm.edges, edges), (self.bm.faces, faces)):
+        for element, value in zip(elements, np.asarray(mask, dtype=bool).tolist()):
+          if element.select != value:
+            element.select = value
+      self.bm.select_flush_mode()
+    else:
+      self._set(self.mesh.vertices, 'select', bool, 1, vertices, None)
+      self._set(self.mesh.edges, 'select', bool, 1, edges, None)
+      self._set(self.mesh.polygons, 'select', bool, 1, faces, None)
+    self._changed()
+
+  # Positions
+
+  def vertex_positions(self):
+    return self._get(self.source.vertices, 'co', np.float32, 3)
+
+  def selected_vertex_positions(self):
+    # Small edit mode selections are cheaper to read from the BMesh than to copy
+    # the whole mesh into a snapshot for
+    if self.bm is not None and self._snapshot is None and self.mesh.total_vert_sel * 2 < len(self.bm.verts):
+      return np.array([v.co[:] for v in self.bm.verts if v.select], dtype=np.float32).reshape(-1, 3)
+    return self.vertex_positions()[self.vertex_selection()]
+
+  def vertex_normals(self):
+    return self._get(self.source.vertex_normals, 'vector', np.float32, 3)
+
+  def set_vertex_positions(self, positions, indices=None):
+    if self.bm is not None:
+      self.bm.verts.ensure_lookup_table()
+      verts = self.bm.verts
+      for i, co in self._pairs(positions, indices):
+        verts[i].co = co
+    else:
+      self._set(self.mesh.vertices, 'co', np.float32, 3, positions, indices)
+    self._changed()
+
+  # UVs
+
+  def uvs(self, name=None):
+    layers = self.source.uv_layers
+    layer = layers.get(name) if name else layers.active
+    if layer is None:
+      return None
+    return self._get(layer.uv, 'vector', np.float32, 2)
+
+  def set_uvs(self, uvs, indices=None, name=None):
+    if self.bm is not None:
+      layers = self.bm.loops.layers.uv
+      layer = layers.get(name) if name else layers.active
+      if layer is None:
+        layer = layers.verify()
+      loops = self._bm_loops(indices)
+      for loop, uv in zip(loops, np.asarray(uvs).tolist()):
+        loop[layer].uv = uv
+    else:
+      layers = self.mesh.uv_layers
+      layer = layers.get(name) if name else layers.active
+      if layer is None:
+        layer = layers.new()
+      self._set(layer.uv, 'vector', np.float32, 2, uvs, indices)
+    self._changed()
+
+  # Color attributes
+
+  def color_attribute(self, name=None):
+    attributes = self.mesh.color_attributes
+    return attributes.get(name) if name else attributes.active_color
+
+  def colors(self, name=None):
+    attribute = self.color_attribute(name)
+    if attribute is None:
+      return None
+    data = self.source.color_attributes[attribute.name].data
+    key = 'color_srgb' if attribute.data_type == 'BYTE_COLOR' else 'color'
+    return self._get(data, key, np.float32, 4)
+
+  def set_colors(self, colors, indices=None, name=None):
+    attribute = self.color_attribute(name)
+    if self.bm is not None:
+      elements = self.bm.verts if attribute.domain == 'POINT' else self.bm.loops
+      layers = elements.layers.color if attribute.data_type == 'BYTE_COLOR' else elements.layers.float_color
+      layer = layers[attribute.name]
+      if attribute.domain == 'POINT':
+        self.bm.verts.ensure_lookup_table()
+        targets = [self.bm.verts[i] for i in (range(len(self.bm.verts)) if indices is None else np.asarray(indices).tolist())]
+      else:
+        targets = self._bm_loops(indices)
+      for element, color in zip(targets, np.asarray(colors).tolist()):
+        element[layer] = color
+    else:
+      key = 'color_srgb' if attribute.data_type == 'BYTE_COLOR' else 'color'
+      self._set(attribute.data, key, np.float32, 4, colors, indices)
+    self._changed()
+
 def make_vertex_group(name, assign=True):
   bpy.context.object.vertex_groups.new(name=name)
   bpy.ops.object.vertex_group_set_active(group=name)
   if assign: bpy.ops.object.vertex_group_assign()
 
-def modifier_exists(modifier_type, name = None):
+def modifier_exists(modifier_type, name = None, obj = None):
+  obj = obj or bpy.context.object
   if name is None:
-    return len([m for m in bpy.context.object.modifiers if m.type == modifier_type]) > 0
+    return len([m for m in obj.modifiers if m.type == modifier_type]) > 0
   else:
-    return len([m for m in bpy.context.object.modifiers if m.type == modifier_type and m.name == name]) > 0
+    return len([m for m in obj.modifiers if m.type == modifier_type and m.name == name]) > 0
 
-def get_modifier(modifier_type, name):
+def get_modifier(modifier_type, name, obj = None):
+  obj = obj or bpy.context.object
   if name is None:
-    return [m for m in bpy.context.object.modifiers if m.type == modifier_type][0]
+    return [m for m in obj.modifiers if m.type == modifier_type][0]
   else:
-    return [m for m in bpy.context.object.modifiers if m.type == modifier_type and m.name == name][0]
+    return [m for m in obj.modifiers if m.type == modifier_type and m.name == name][0]
 
-def move_modifier_on_top(modifier_name):
-  bpy.ops.object.modifier_move_to_index(modifier=modifier_name, index=0)
+def move_modifier_on_top(modifier_name, obj = None):
+  obj = obj or bpy.context.object
+  obj.modifiers.move(obj.modifiers.find(modifier_name), 0)
 
-def add_or_get_modifier(modifier_name, modifier_type, move_on_top=False):
-  if modifier_exists(modifier_type):
-    for modifier in bpy.context.object.modifiers:
+def add_or_get_modifier(modifier_name, modifier_type, move_on_top=False, obj=None):
+  obj = obj or bpy.context.object
+  if modifier_exists(modifier_type, obj=obj):
+    for modifier in obj.modifiers:
       if modifier.type == modifier_type:
         return modifier
-  modifier = bpy.context.object.modifiers.new(name=modifier_name, type=modifier_type)
-  if move_on_top: move_modifier_on_top(modifier.name)
+  modifier = obj.modifiers.new(name=modifier_name, type=modifier_type)
+  if move_on_top: move_modifier_on_top(modifier.name, obj)
   return modifier
 
+# Names of modifiers added by Quick Menu operators start with this
+MODIFIER_PREFIX = 'QM'
+
+# Modifier types that simulate rather than generate geometry, never applied in batches
+SIMULATION_MODIFIER_TYPES = {'CLOTH', 'COLLISION', 'SOFT_BODY', 'FLUID', 'DYNAMIC_PAINT', 'PARTICLE_SYSTEM'}
+
+def is_quick_menu_modifier(modifier):
+  return modifier.name.startswith(MODIFIER_PREFIX) and modifier.type not in SIMULATION_MODIFIER_TYPES
+
+def modifier_signature(modifier):
+  # Settings of a modifier, to tell whether two objects' modifiers give the same result
+  values = []
+  for prop in modifier.bl_rna.properties:
+    if prop.type == 'COLLECTION' or prop.identifier in {'rna_type', 'name', 'show_expanded', 'is_active', 'persistent_uid'}: continue
+    value = getattr(modifier, prop.identifier, None)
+    if isinstance(value, bpy.types.ID):
+      value = value.session_uid
+    elif prop.type == 'POINTER':
+      continue
+    elif isinstance(value, set):
+      value = tuple(sorted(value))
+    elif hasattr(value, '__len__') and not isinstance(value, str):
+      value = tuple(value)
+    values.append((prop.identifier, value))
+  return tuple(values)
+
+def references_objects(modifier):
+  # Whether the modifier's result depends on where the object sits relative to other objects
+  return any(
+    isinstance(getattr(modifier, prop.identifier, None), (bpy.types.Object, bpy.types.Collection))
+    for prop in modifier.bl_rna.properties if prop.type == 'POINTER'
+  )
+
+def apply_modifiers(objects, modifier_filter = is_quick_menu_modifier):
+  # Apply the enabled modifiers matching modifier_filter to the mesh data of every
+  # object, like modifier_apply in stack order but without operators, mode or
+  # selection changes. The other modifiers are switched off and everything is
+  # evaluated in one depsgraph update. Objects sharing mesh data and matching
+  # modifiers share the result, if their modifiers reference other objects they
+  # also have to share the transform. Returns the number of meshes built
+  groups = {}
+  for obj in objects:
+    if obj.type != 'MESH' or obj.data.shape_keys: continue
+    applied = [m for m in obj.modifiers if m.show_viewport and modifier_filter(m)]
+    if not applied: continue
+    key = (obj.data.session_uid, tuple(modifier_signature(m) for m in applied))
+    if any(references_objects(m) for m in applied):
+      key += (tuple(map(tuple, obj.matrix_world)),)
+    groups.setdefault(key, []).append((obj, applied))
+  if not groups:
+    return 0
+
+  representatives = [group[0] for group in groups.values()]
+  disabled = [m for obj, applied in representatives for m in obj.modifiers if m.show_viewport and m not in applied]
+  for modifier in disabled: modifier.show_viewport = False
+  try:
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    meshes = [
+      bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+      for obj, _ in representatives
+    ]
+  finally:
+    for modifier in disabled: modifier.show_viewport = True
+
+  for group, mesh in zip(groups.values(), meshes):
+    old_mesh = group[0][0].data
+    for obj, applied in group:
+      obj.data = mesh
+      for modifier in applied: obj.modifiers.remove(modifier)
+    if old_mesh.users == 0:
+      name = old_mesh.name
+      bpy.data.meshes.remove(old_mesh)
+      mesh.name = name
+  return len(meshes)
+
+# Answers to edit mode state queries (used by polls on every menu redraw).
+# Cleared on every depsgraph update, entries are also keyed by cheap counters
+# so that a stale answer is never returned for an edited mesh
+_state_cache = {}
+
+@bpy.app.handlers.persistent
+def clear_state_cache(*args):
+  _state_cache.clear()
+
+# Per datablock counters bumped on every depsgraph update of meshes, materials
+# and node trees, so caches can be keyed by data version
+_data_versions = {}
+
+@bpy.app.handlers.persistent
+def track_data_versions(scene, depsgraph):
+  for update in depsgraph.updates:
+    if isinstance(update.id, (bpy.types.Mesh, bpy.types.Material, bpy.types.NodeTree)):
+      bump_data_version(update.id.original)
+
+def data_version(id_data):
+  return (id_data.session_uid, _data_versions.get(id_data.session_uid, 0))
+
+def bump_data_version(id_data):
+  # Also called by writes that no depsgraph update has seen yet
+  _data_versions[id_data.session_uid] = _data_versions.get(id_data.session_uid, 0) + 1
+
+# Memoize compute(obj) for a named query until obj's edit data changes
+def query_state(query, obj, compute):
+  data = obj.data
+  key = (query, data.as_pointer())
+  if obj.type == 'MESH':
+    bm = bmesh.from_edit_mesh(data)
+    key += (len(bm.verts), data.total_vert_sel, data.total_face_sel)
+  if key not in _state_cache:
+    _state_cache[key] = compute(obj)
+  return _state_cache[key]
+
+def _curve_has_selection(obj):
+  return any(p.select_control_point for spline in obj.data.splines for p in spline.bezier_points)
+
+def _mesh_has_hidden(obj):
+  return any(v.hide for v in bmesh.from_edit_mesh(obj.data).verts)
+
 def anything_is_selected_in_editmode():
   for o in bpy.context.objects_in_mode:
     if o.type == 'MESH':
-      if True in [v.select for v in bmesh.from_edit_mesh(o.data).verts]:
+      # The edit mesh keeps a native count of selected vertices
+      if o.data.total_vert_sel > 0:
         return True
     elif o.type == 'CURVE':
-      for spline in o.data.splines:
-        for p in spline.bezier_points:
-          if p.select_control_point:
-            return True
+      if query_state('selected', o, _curve_has_selection):
+        return True
   return False
 
 def anything_is_hidden_in_editmode():
   for o in bpy.context.objects_in_mode:
-    if True in [v.hide for v in bmesh.from_edit_mesh(o.data).verts]:
+    if o.type == 'MESH' and query_state('hidden', o, _mesh_has_hidden):
       return True
   return False
 
@@ -1,4 +1,4 @@
-import bpy, re, json, os, platform, subprocess, shutil
+import bpy, re, json, os, platform, subprocess, shutil, bisect
 from bpy.props import *
 
 _expanded_groups = set()
@@ -293,6 +293,39 @@ def _load_config(config_path):
 def _save_config(config_path, data):
     with open(config_path, "w") as f:
         json.dump(data, f, indent=2)
+    # A quick re-save can keep the same mtime and size, don't trust the cache
+    _include_cache.pop(os.path.normpath(config_path), None)
+
+
+# Parsed include files keyed by path: (mtime_ns, size, data)
+_include_cache = {}
+
+
+def resolve_include_path(config_path, include_path):
+    """Resolve an include item's path relative to the config that references it."""
+    include_path = os.path.expanduser(include_path)
+    if not os.path.isabs(include_path):
+        include_path = os.path.join(os.path.dirname(config_path), include_path)
+    return os.path.normpath(include_path)
+
+
+def load_included_config(path):
+    """Read and parse an included config, reusing the cached result while the file is unchanged."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        _include_cache.pop(path, None)
+        return None
+    cached = _include_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    try:
+        data = _load_config(path)
+    except:
+        print(f"[QuickMenu] Failed to load included config: {path}")
+        data = None
+    _include_cache[path] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
 
 
 def get_user_preferences():
@@ -452,6 +485,21 @@ def _save_current_edit(context):
         params = _collect_params(scene.qm_edit_params)
         entry.params = json.dumps(params) if params else ""
     entry.mode = mode if mode and mode != "ANY" else ""
+    _update_index_row(entry)
+
+
+def _update_index_row(entry):
+    """Mirror an edited display entry back into the display index."""
+    if not 0 <= entry.position < len(_index):
+        return
+    row = _index[entry.position]
+    if row["mode"] != entry.mode:
+        _mode_positions[row["mode"]].remove(entry.position)
+        bisect.insort(_mode_positions.setdefault(entry.mode, []), entry.position)
+    for field in ("item_name", "operator", "menu", "params", "mode"):
+        row[field] = getattr(entry, field)
+    _update_search_key(row)
+    _filter_cache.clear()
 
 
 def _on_selection_changed(self, context):
@@ -489,10 +537,38 @@ def _on_edit_operator_field(self, context):
 
 
 # --- Display list ---
+#
+# The whole active config is flattened once into ``_index`` (plain dicts, one
+# per item, collapsed children included). Expansion and filtering only select
+# positions from that index, and just the visible window of ``ITEM_LIST_ROWS``
+# rows is copied into ``Scene.qm_item_list`` for ``template_list`` to draw.
+
+ITEM_LIST_ROWS = 16
+
+_index = []
+_mode_positions = {}
+_visible = []
+_filter_cache = {}
+
+_ENTRY_FIELDS = (
+    "item_name",
+    "operator",
+    "menu",
+    "params",
+    "mode",
+    "is_group",
+    "is_separator",
+    "is_menu",
+    "depth",
+    "group_path",
+    "address",
+    "config_path",
+    "include_path",
+)
 
 
 def refresh_cached_items():
-    """Rebuild the scene display list from the active config."""
+    """Rebuild the display index from the active config."""
     global _suppress_edit_save
     was_suppressed = _suppress_edit_save
     _suppress_edit_save = True
@@ -500,7 +576,9 @@ def refresh_cached_items():
     if scene is None:
         _suppress_edit_save = was_suppressed
         return
-    scene.qm_item_list.clear()
+    _index.clear()
+    _mode_positions.clear()
+    _filter_cache.clear()
     config_path = get_active_user_config_path()
     if config_path:
         try:
@@ -508,51 +586,155 @@ def refresh_cached_items():
         except:
             data = None
         if data is not None:
-            _walk_items(scene, config_path, data.get("items", []), 0, "", [])
+            _index_items(config_path, data.get("items", []), 0, "", [])
+    _update_visible(scene)
+    _materialize_window(scene)
     _load_selection_into_edit(bpy.context)
     _suppress_edit_save = was_suppressed
 
 
-def _make_entry(scene, config_path, address, depth, group_path):
-    """Create a display entry with common fields."""
-    entry = scene.qm_item_list.add()
-    entry.depth = depth
-    entry.group_path = group_path
-    entry.address = ",".join(str(x) for x in address)
-    entry.config_path = config_path
-    return entry
+def _make_row(config_path, address, depth, group_path):
+    """Create an index row with common fields."""
+    return {
+        "item_name": "",
+        "operator": "",
+        "menu": "",
+        "params": "",
+        "mode": "",
+        "is_group": False,
+        "is_separator": False,
+        "is_menu": False,
+        "depth": depth,
+        "group_path": group_path,
+        "address": ",".join(str(x) for x in address),
+        "config_path": config_path,
+        "include_path": "",
+    }
 
 
-def _walk_items(scene, config_path, items, depth, group_path, address_prefix):
+def _update_search_key(row):
+    row["search"] = "\n".join((row["item_name"], row["operator"], row["menu"])).lower()
+
+
+def _index_items(config_path, items, depth, group_path, address_prefix):
     for i, item in enumerate(items):
         address = address_prefix + [i]
         item_type = item.get("type", "operator")
+        position = len(_index)
+        row = _make_row(config_path, address, depth, group_path)
+        _index.append(row)
 
         if item_type == "group":
             name = item.get("name", "")
             gp = (group_path + "/" + name) if group_path else name
-            entry = _make_entry(scene, config_path, address, depth, gp)
-            entry.is_group = True
-            entry.item_name = name
-            entry.expanded = gp in _expanded_groups
-            if entry.expanded:
-                _walk_items(
-                    scene, config_path, item.get("children", []), depth + 1, gp, address
-                )
+            row["is_group"] = True
+            row["item_name"] = name
+            row["group_path"] = gp
+            _index_items(config_path, item.get("children", []), depth + 1, gp, address)
+        elif item_type == "include":
+            # Included files are only read once their group is expanded
+            name = item.get("name", "")
+            gp = (group_path + "/" + name) if group_path else name
+            include_path = resolve_include_path(config_path, item.get("path", ""))
+            row["is_group"] = True
+            row["item_name"] = name
+            row["group_path"] = gp
+            row["include_path"] = include_path
+            if gp in _expanded_groups:
+                data = load_included_config(include_path)
+                if data is not None:
+                    _index_items(include_path, data.get("items", []), depth + 1, gp, [])
         elif item_type == "separator":
-            _make_entry(
-                scene, config_path, address, depth, group_path
-            ).is_separator = True
+            row["is_separator"] = True
         else:  # operator or menu
-            entry = _make_entry(scene, config_path, address, depth, group_path)
-            entry.item_name = item.get("name", "")
-            entry.mode = item.get("mode", "")
+            row["item_name"] = item.get("name", "")
+            row["mode"] = item.get("mode", "")
             if item_type == "menu":
-                entry.is_menu = True
-                entry.menu = item.get("menu", "")
+                row["is_menu"] = True
+                row["menu"] = item.get("menu", "")
             else:
-                entry.operator = item.get("operator", "")
-                entry.params = json.dumps(item["params"]) if "params" in item else ""
+                row["operator"] = item.get("operator", "")
+                row["params"] = json.dumps(item["params"]) if "params" in item else ""
+            _mode_positions.setdefault(row["mode"], []).append(position)
+
+        # Position right after this row's subtree, used to skip collapsed groups
+        row["end"] = len(_index)
+        _update_search_key(row)
+
+
+def _filter_positions(text, mode):
+    """Return index positions matching a name/operator substring and a mode."""
+    key = (text, mode)
+    if key in _filter_cache:
+        return _filter_cache[key]
+    if mode and mode != "ANY":
+        candidates = _mode_positions.get(mode, [])
+    else:
+        candidates = range(len(_index))
+    if text:
+        result = [i for i in candidates if text in _index[i]["search"]]
+    else:
+        result = list(candidates)
+    _filter_cache[key] = result
+    return result
+
+
+def _update_visible(scene):
+    """Recompute the positions listed in the panel: the expanded tree or the filter result."""
+    text = scene.qm_item_filter.strip().lower()
+    mode = scene.qm_item_filter_mode
+    if text or mode != "ANY":
+        _visible[:] = _filter_positions(text, mode)
+        return
+    _visible.clear()
+    i = 0
+    while i < len(_index):
+        row = _index[i]
+        _visible.append(i)
+        if row["is_group"] and row["group_path"] not in _expanded_groups:
+            i = row["end"]
+        else:
+            i += 1
+
+
+def _materialize_window(scene):
+    """Copy the visible window of index rows into the scene display list."""
+    offset = max(0, min(scene.qm_item_list_offset, len(_visible) - ITEM_LIST_ROWS))
+    if scene.qm_item_list_offset != offset:
+        scene.qm_item_list_offset = offset
+    scene.qm_item_list.clear()
+    for position in _visible[offset : offset + ITEM_LIST_ROWS]:
+        row = _index[position]
+        entry = scene.qm_item_list.add()
+        for field in _ENTRY_FIELDS:
+            setattr(entry, field, row[field])
+        entry.expanded = row["is_group"] and row["group_path"] in _expanded_groups
+        entry.position = position
+
+
+def _select_position(scene, position):
+    """Scroll the window so an index position is listed and make it the selection."""
+    try:
+        visible_index = _visible.index(position)
+    except ValueError:
+        visible_index = -1
+    if visible_index >= 0:
+        offset = scene.qm_item_list_offset
+        if not offset <= visible_index < offset + ITEM_LIST_ROWS:
+            scene.qm_item_list_offset = max(0, visible_index - ITEM_LIST_ROWS // 2)
+    _materialize_window(scene)
+    if visible_index >= 0:
+        scene.qm_item_list_index = visible_index - scene.qm_item_list_offset
+
+
+def _on_filter_changed(self, context):
+    scene = _get_scene_from_context(context)
+    if scene is None:
+        return
+    scene.qm_item_list_offset = 0
+    _update_visible(scene)
+    _materialize_window(scene)
+    scene.qm_item_list_index = 0 if scene.qm_item_list else -1
 
 
 def get_insert_position(context):
@@ -561,6 +743,10 @@ def get_insert_position(context):
     idx = scene.qm_item_list_index
     if 0 <= idx < len(scene.qm_item_list):
         entry = scene.qm_item_list[idx]
+        if entry.include_path:
+            data = _load_config(entry.include_path)
+            items = data.setdefault("items", [])
+            return entry.include_path, data, items, len(items)
         config_path = entry.config_path
         if config_path and not is_builtin_config(config_path):
             data = _load_config(config_path)
@@ -945,11 +1131,50 @@ class QuickMenuToggleGroupOperator(bpy.types.Operator):
 
     def execute(self, context):
         _expanded_groups.symmetric_difference_update({self.group_path})
-        refresh_cached_items()
-        for i, entry in enumerate(context.scene.qm_item_list):
-            if entry.is_group and entry.group_path == self.group_path:
-                context.scene.qm_item_list_index = i
+        scene = context.scene
+        if self.group_path in _expanded_groups and any(
+            row["include_path"] and row["group_path"] == self.group_path
+            for row in _index
+        ):
+            # Index the included file now that its group is expanded
+            refresh_cached_items()
+        _update_visible(scene)
+        for position in _visible:
+            row = _index[position]
+            if row["is_group"] and row["group_path"] == self.group_path:
+                _select_position(scene, position)
                 break
+        else:
+            _materialize_window(scene)
+        return {"FINISHED"}
+
+
+class QuickMenuScrollItemListOperator(bpy.types.Operator):
+    """Scroll the menu item list by one page"""
+
+    bl_idname = "qm.scroll_item_list"
+    bl_label = "Scroll Item List"
+
+    direction: StringProperty(options={"HIDDEN", "SKIP_SAVE"})
+
+    def execute(self, context):
+        scene = context.scene
+        idx = scene.qm_item_list_index
+        selected = (
+            scene.qm_item_list[idx].position
+            if 0 <= idx < len(scene.qm_item_list)
+            else -1
+        )
+        step = -ITEM_LIST_ROWS if self.direction == "UP" else ITEM_LIST_ROWS
+        scene.qm_item_list_offset = max(0, scene.qm_item_list_offset + step)
+        _materialize_window(scene)
+        for i, entry in enumerate(scene.qm_item_list):
+            if entry.position == selected:
+                if i != idx:
+                    scene.qm_item_list_index = i
+                break
+        else:
+            scene.qm_item_list_index = -1
         return {"FINISHED"}
 
 
@@ -990,6 +1215,8 @@ class QuickMenuItemEntry(bpy.types.PropertyGroup):
     group_path: StringProperty()
     address: StringProperty(default="")
     config_path: StringProperty(default="")
+    include_path: StringProperty(default="")
+    position: IntProperty(default=-1)
 
 
 class VIEW3D_PT_QuickMenuEditor(bpy.types.Panel):
@@ -1031,7 +1258,7 @@ class VIEW3D_PT_QuickMenuEditor(bpy.types.Panel):
         se = scene.qm_item_list[idx] if 0 <= idx < len(scene.qm_item_list) else None
         group_path = se.group_path if se else ""
 
-        if not scene.qm_item_list:
+        if not _index:
             layout.label(text="No items loaded", icon="INFO")
             layout.operator(
                 "qm.add_group", text="Add Group", icon="FILE_FOLDER"
@@ -1039,17 +1266,39 @@ class VIEW3D_PT_QuickMenuEditor(bpy.types.Panel):
             layout.operator("qm.add_item", text="Add Item", icon="ADD").group_path = ""
             return
 
+        row = layout.row(align=True)
+        row.prop(scene, "qm_item_filter", text="", icon="VIEWZOOM")
+        row.prop(scene, "qm_item_filter_mode", text="")
+
         row = layout.row()
-        row.template_list(
+        list_column = row.column()
+        list_column.template_list(
             "UI_UL_QuickMenuItemList",
             "",
             scene,
             "qm_item_list",
             scene,
             "qm_item_list_index",
-            rows=16,
+            rows=ITEM_LIST_ROWS,
         )
 
+        if len(_visible) > ITEM_LIST_ROWS:
+            offset = scene.qm_item_list_offset
+            page_row = list_column.row(align=True)
+            sub = page_row.row(align=True)
+            sub.enabled = offset > 0
+            sub.operator(
+                "qm.scroll_item_list", icon="TRIA_UP", text=""
+            ).direction = "UP"
+            page_row.label(
+                text=f"{offset + 1}-{offset + len(scene.qm_item_list)} of {len(_visible)}"
+            )
+            sub = page_row.row(align=True)
+            sub.enabled = offset + ITEM_LIST_ROWS < len(_visible)
+            sub.operator(
+                "qm.scroll_item_list", icon="TRIA_DOWN", text=""
+            ).direction = "DOWN"
+
         col = row.column(align=True)
         col.operator(
             "qm.add_group", icon="FILE_FOLDER", text=""
@@ -1104,6 +1353,7 @@ classes = (
     QuickMenuParamEntry,
     QuickMenuItemEntry,
     QuickMenuToggleGroupOperator,
+    QuickMenuScrollItemListOperator,
     UI_UL_QuickMenuItemList,
     VIEW3D_PT_QuickMenuEditor,
     QuickMenuAddItemOperator,
@@ -1127,6 +1377,15 @@ def register():
     bpy.types.Scene.qm_item_list_index = bpy.props.IntProperty(
         update=_on_selection_changed
     )
+    bpy.types.Scene.qm_item_list_offset = bpy.props.IntProperty(min=0)
+    bpy.types.Scene.qm_item_filter = bpy.props.StringProperty(
+        name="Filter",
+        description="Filter items by name, operator or menu",
+        update=_on_filter_changed,
+    )
+    bpy.types.Scene.qm_item_filter_mode = bpy.props.EnumProperty(
+        name="Mode Filter", items=MODE_ITEMS, default="ANY", update=_on_filter_changed
+    )
     bpy.types.WindowManager.qm_operator_list = bpy.props.CollectionProperty(
         type=QuickMenuOperatorEntry
     )
@@ -1154,6 +1413,9 @@ def unregister():
     del bpy.types.Scene.qm_edit_operator
     del bpy.types.Scene.qm_edit_name
     del bpy.types.WindowManager.qm_operator_list
+    del bpy.types.Scene.qm_item_filter_mode
+    del bpy.types.Scene.qm_item_filter
+    del bpy.types.Scene.qm_item_list_offset
     del bpy.types.Scene.qm_item_list_index
     del bpy.types.Scene.qm_item_list
     for cls in reversed(classes):
@@ -102,21 +102,21 @@ class AddBodyOperator(bpy.types.Operator):
     return len(context.selected_objects) > 0
 
   def execute(self, context):
-    all_selected_objects = context.selected_objects
+    meshes = [o for o in context.selected_objects if o.type == 'MESH']
+    if not meshes:
+      return {'FINISHED'}
 
-    for obj in all_selected_objects:
-      if obj.type == 'MESH':
-        select(obj)
-        bpy.ops.rigidbody.object_add()
-        bpy.context.object.rigid_body.type = self.type
-        bpy.context.object.rigid_body.friction = self.friction
-        bpy.context.object.rigid_body.restitution = self.bounciness
-
-        if self.type == 'ACTIVE':
-          bpy.context.object.rigid_body.mass = self.mass
- 
-    for obj in all_selected_objects:
-      obj.select_set(True)
+    # Adds rigid bodies to all of the objects in one call
+    with objects_override(meshes):
+      bpy.ops.rigidbody.objects_add(type=self.type)
+
+    for obj in meshes:
+      obj.rigid_body.type = self.type
+      obj.rigid_body.friction = self.friction
+      obj.rigid_body.restitution = self.bounciness
+
+      if self.type == 'ACTIVE':
+        obj.rigid_body.mass = self.mass
     return {'FINISHED'}
 
 class RemoveBodyOperator(bpy.types.Operator):
@@ -137,13 +137,10 @@ class RemoveBodyOperator(bpy.types.Operator):
     if self.apply_transforms:
       bpy.ops.object.visual_transform_apply()
 
-    for obj in all_selected_objects:
-      if obj.type == 'MESH' and obj.rigid_body:
-        select(obj)
-        bpy.ops.rigidbody.object_remove()
-
-    for obj in all_selected_objects:
-      obj.select_set(True)
+    bodies = [o for o in all_selected_objects if o.type == 'MESH' and o.rigid_body]
+    if bodies:
+      with objects_override(bodies):
+        bpy.ops.rigidbody.objects_remove()
 
     return {'FINISHED'}
 
@@ -157,16 +154,12 @@ class AddCollisionOperator(bpy.types.Operator):
   cloth_friction: bpy.props.FloatProperty(name='Cloth Friction', default=5, min=0, max=80)
 
   def execute(self, context):
-    all_selected_objects = context.selected_objects
-
-    for obj in all_selected_objects:
-      select(obj)
+    def add_collision(obj):
       add_or_get_modifier('QMCollision', 'COLLISION')
-      context.object.collision.thickness_outer = self.thickness_outer
-      context.object.collision.cloth_friction = self.cloth_friction
-    
-    for obj in all_selected_objects:
-      obj.select_set(True)
+      obj.collision.thickness_outer = self.thickness_outer
+      obj.collision.cloth_friction = self.cloth_friction
+
+    batch_execute(context.selected_objects, add_collision)
     return {'FINISHED'}
 
 class AddClothOperator(bpy.types.Operator):
@@ -188,10 +181,7 @@ class AddClothOperator(bpy.types.Operator):
   self_collisions: bpy.props.BoolProperty(name='Self Collisions', default=False)
 
   def execute(self, context):
-    all_selected_objects = context.selected_objects
-
-    for obj in all_selected_objects:
-      select(obj)
+    def add_cloth(obj):
       c = add_or_get_modifier('QMCloth', 'CLOTH')
       c.settings.use_pressure = self.pressure != 0
       c.settings.uniform_pressure_force = self.pressure
@@ -200,10 +190,8 @@ class AddClothOperator(bpy.types.Operator):
       c.settings.shear_stiffness = self.shear
       c.settings.bending_stiffness = self.bending
       c.collision_settings.use_self_collision = self.self_collisions
-    
-    for obj in all_selected_objects:
-      obj.select_set(True)
 
+    batch_execute(context.selected_objects, add_cloth)
     context.scene.frame_set(0)
     return {'FINISHED'}
 
@@ -1,6 +1,290 @@
-import bpy
+import bpy, bmesh, math
+import numpy as np
+from mathutils import Vector
 from .. common.common import *
 
+# Names of the boolean modifiers added by Quick Menu start with this
+BOOLEAN_MODIFIER_NAME = 'QMBoolean'
+
+# Parent of the collections holding the cutters of collection operand booleans
+CUTTERS_COLLECTION_NAME = 'QM Cutters'
+
+def managed_booleans(obj):
+  return [m for m in obj.modifiers if m.type == 'BOOLEAN' and m.name.startswith(BOOLEAN_MODIFIER_NAME)]
+
+def cutters_collection(target, operation):
+  # Collection operand of the target's managed boolean with this operation,
+  # created under the shared cutters collection if there's none yet
+  for modifier in managed_booleans(target):
+    if modifier.operand_type == 'COLLECTION' and modifier.operation == operation and modifier.collection:
+      return modifier, modifier.collection
+  parent = bpy.data.collections.get(CUTTERS_COLLECTION_NAME)
+  if parent is None:
+    parent = bpy.data.collections.new(CUTTERS_COLLECTION_NAME)
+  if parent.name not in bpy.context.scene.collection.children:
+    bpy.context.scene.collection.children.link(parent)
+  collection = bpy.data.collections.new(f'{target.name} {operation.title()}')
+  parent.children.link(collection)
+  return None, collection
+
+def move_to_collection(obj, collection):
+  if obj.name not in collection.objects:
+    collection.objects.link(obj)
+  for other in obj.users_collection:
+    if other != collection:
+      other.objects.unlink(obj)
+
+# Seconds without cutter transforms before previewed booleans are evaluated exactly again
+PREVIEW_RESTORE_DELAY = 0.3
+
+# Object property with the solver or viewport visibility the object's previewed
+# booleans had before the preview, by modifier name. It lives in the file data,
+# so undo steps pushed while previewing carry the originals along
+PREVIEWED_BOOLEANS_PROPERTY = 'qm_previewed_booleans'
+
+def boolean_cutters(modifier):
+  if modifier.operand_type == 'COLLECTION':
+    return modifier.collection.all_objects if modifier.collection else ()
+  return (modifier.object,) if modifier.object else ()
+
+def restore_previewed_booleans():
+  for obj in bpy.data.objects:
+    originals = obj.get(PREVIEWED_BOOLEANS_PROPERTY)
+    if originals is None: continue
+    for name, original in originals.items():
+      modifier = obj.modifiers.get(name)
+      if modifier is None: continue
+      if 'solver' in original and modifier.solver != original['solver']:
+        modifier.solver = original['solver']
+      if 'show_viewport' in original and modifier.show_viewport != bool(original['show_viewport']):
+        modifier.show_viewport = bool(original['show_viewport'])
+    del obj[PREVIEWED_BOOLEANS_PROPERTY]
+
+def _restore_booleans_when_idle():
+  # Interaction isn't over while a modal operator like transform is running
+  for window in bpy.context.window_manager.windows:
+    if any(op.bl_idname.startswith('TRANSFORM_OT') for op in getattr(window, 'modal_operators', ())):
+      return PREVIEW_RESTORE_DELAY
+  restore_previewed_booleans()
+  return None
+
+@bpy.app.handlers.persistent
+def preview_booleans(scene, depsgraph):
+  # Switch the booleans of moved cutters to the preview while they move
+  mode = scene.quick_menu.boolean_preview
+  if mode == 'OFF': return
+  moved = {u.id.original for u in depsgraph.updates if u.is_updated_transform and isinstance(u.id, bpy.types.Object)}
+  if not moved: return
+  previewing = False
+  for obj in scene.objects:
+    for modifier in managed_booleans(obj):
+      if moved.isdisjoint(boolean_cutters(modifier)): continue
+      previewing = True
+      if modifier.name in obj.get(PREVIEWED_BOOLEANS_PROPERTY, ()): continue
+      # Only what the preview changes is recorded, so a preview state is never
+      # taken for the original
+      if mode == 'FLOAT' and modifier.solver != 'FLOAT':
+        original = {'solver': modifier.solver}
+        modifier.solver = 'FLOAT'
+      elif mode == 'DISABLE' and modifier.show_viewport:
+        original = {'show_viewport': True}
+        modifier.show_viewport = False
+      else:
+        continue
+      if PREVIEWED_BOOLEANS_PROPERTY not in obj:
+        obj[PREVIEWED_BOOLEANS_PROPERTY] = {}
+      obj[PREVIEWED_BOOLEANS_PROPERTY][modifier.name] = original
+  if previewing:
+    if bpy.app.timers.is_registered(_restore_booleans_when_idle):
+      bpy.app.timers.unregister(_restore_booleans_when_idle)
+    bpy.app.timers.register(_restore_booleans_when_idle, first_interval=PREVIEW_RESTORE_DELAY)
+
+@bpy.app.handlers.persistent
+def restore_booleans_now(*args):
+  # Renders, saved files and undo steps always get exact booleans. The transform's
+  # own undo push happens before the idle restore, stepping back onto it restores
+  # the originals that step recorded
+  if bpy.app.timers.is_registered(_restore_booleans_when_idle):
+    bpy.app.timers.unregister(_restore_booleans_when_idle)
+  restore_previewed_booleans()
+
+# Object property listing the booleans of the object disabled by culling
+CULLED_BOOLEANS_PROPERTY = 'qm_culled_booleans'
+
+# Local bounds of mesh data without modifiers, by mesh, for one data version
+_mesh_bounds = {}
+
+def _mesh_data_bounds(mesh):
+  cached = _mesh_bounds.get(mesh.session_uid)
+  if cached is None or cached[0] != data_version(mesh):
+    if mesh.is_editmode:
+      # Mesh vertices are stale until edit mode is left, read the BMesh
+      positions = np.array([v.co for v in bmesh.from_edit_mesh(mesh).verts], dtype=np.float32).reshape(-1, 3)
+    else:
+      positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+      mesh.vertices.foreach_get('co', positions)
+      positions = positions.reshape(-1, 3)
+    bounds = (positions.min(axis=0), positions.max(axis=0)) if len(positions) else (np.zeros(3), np.zeros(3))
+    cached = _mesh_bounds[mesh.session_uid] = (data_version(mesh), *bounds)
+  return cached[1:]
+
+def world_bounds(objects, include_mesh_data = False):
+  # World space axis aligned bounds (n x 2 x 3) of the evaluated bounding boxes.
+  # Mesh data bounds can be included, so that the bounds of a target don't shrink
+  # with its own cuts
+  local = np.array([obj.bound_box for obj in objects], dtype=np.float64).reshape(-1, 8, 3)
+  low, high = local.min(axis=1), local.max(axis=1)
+  if include_mesh_data:
+    for i, obj in enumerate(objects):
+      if obj.type != 'MESH': continue
+      mesh_low, mesh_high = _mesh_data_bounds(obj.data)
+      low[i], high[i] = np.minimum(low[i], mesh_low), np.maximum(high[i], mesh_high)
+  corner_bits = (np.arange(8)[:, None] >> np.arange(3)) & 1
+  corners = np.where(corner_bits, high[:, None], low[:, None])
+  matrices = np.array([obj.matrix_world for obj in objects], dtype=np.float64).reshape(-1, 4, 4)
+  world = corners @ matrices[:, :3, :3].transpose(0, 2, 1) + matrices[:, None, :3, 3]
+  return np.stack((world.min(axis=1), world.max(axis=1)), axis=1)
+
+def cull_booleans(targets):
+  # Disable the difference booleans of the targets whose cutters don't overlap the
+  # target's bounds, and enable the ones disabled before that overlap again.
+  # Every boolean is tested against its own cutters, all pairs at once
+  entries, cutters, pairs = [], {}, []
+  for target in targets:
+    culled = set(target.get(CULLED_BOOLEANS_PROPERTY, ()))
+    for modifier in managed_booleans(target):
+      if modifier.operation != 'DIFFERENCE' or modifier.name in target.get(PREVIEWED_BOOLEANS_PROPERTY, ()): continue
+      # Leave booleans disabled by hand alone
+      if modifier.name not in culled and not modifier.show_viewport: continue
+      modifier_cutters = [c for c in boolean_cutters(modifier) if c.type == 'MESH']
+      if not modifier_cutters: continue
+      for cutter in modifier_cutters:
+        pairs.append((len(entries), cutters.setdefault(cutter, len(cutters))))
+      entries.append((target, modifier, modifier.name in culled))
+  if not entries:
+    return 0, 0
+
+  targets = list(dict.fromkeys(target for target, _, _ in entries))
+  target_indices = {target: i for i, target in enumerate(targets)}
+  target_bounds = world_bounds(targets, include_mesh_data=True)
+  cutter_bounds = world_bounds(list(cutters))
+  pairs = np.array(pairs)
+  pair_targets = np.array([target_indices[target] for target, _, _ in entries])[pairs[:, 0]]
+  t, c = target_bounds[pair_targets], cutter_bounds[pairs[:, 1]]
+  overlaps = ((c[:, 0] <= t[:, 1]) & (c[:, 1] >= t[:, 0])).all(axis=1)
+  overlapping = np.bincount(pairs[:, 0], weights=overlaps, minlength=len(entries)) > 0
+
+  disabled = enabled = 0
+  for (target, modifier, culled), overlap in zip(entries, overlapping.tolist()):
+    if overlap == (not culled): continue
+    modifier.show_viewport = modifier.show_render = overlap
+    names = set(target.get(CULLED_BOOLEANS_PROPERTY, ()))
+    names.symmetric_difference_update({modifier.name})
+    target[CULLED_BOOLEANS_PROPERTY] = sorted(names)
+    if overlap: enabled += 1
+    else: disabled += 1
+  return disabled, enabled
+
+def uncull_booleans(objects):
+  for obj in objects:
+    for name in obj.get(CULLED_BOOLEANS_PROPERTY, ()):
+      modifier = obj.modifiers.get(name)
+      if modifier: modifier.show_viewport = modifier.show_render = True
+    if CULLED_BOOLEANS_PROPERTY in obj:
+      del obj[CULLED_BOOLEANS_PROPERTY]
+
+@bpy.app.handlers.persistent
+def recull_booleans(scene, depsgraph):
+  # Keep culling up to date while targets and cutters move or change
+  if not scene.quick_menu.boolean_culling: return
+  changed = {
+    u.id.original for u in depsgraph.updates
+    if isinstance(u.id, bpy.types.Object) and (u.is_updated_transform or u.is_updated_geometry)
+  }
+  if not changed: return
+  targets = [
+    obj for obj in scene.objects
+    if any(obj in changed or not changed.isdisjoint(boolean_cutters(m)) for m in managed_booleans(obj))
+  ]
+  if targets:
+    cull_booleans(targets)
+
+# Faces with a smaller area are degenerate
+ZERO_AREA = 1e-10
+
+# Problems of meshes that make booleans fail or slow, by mesh, for one data version
+_readiness_cache = {}
+
+def boolean_readiness(access):
+  # Edge masks of open boundaries and non-manifold edges (wire or shared by more
+  # than two faces), a face mask of zero area faces, and whether a closed mesh
+  # is inside out, from edge-face incidence counts and a signed volume
+  mesh = access.mesh
+  cached = _readiness_cache.get(mesh.session_uid)
+  if cached is not None and cached[0] == data_version(mesh):
+    return cached[1]
+  starts, totals = access.loop_starts(), access.loop_totals()
+  incidence = np.bincount(access.loop_edges(), minlength=len(access.source.edges))
+  boundary, non_manifold = incidence == 1, (incidence == 0) | (incidence > 2)
+  corners = access.vertex_positions()[access.loop_vertices()].astype(np.float64)
+  zero_area = polygon_areas(corners, starts, totals) < ZERO_AREA
+  inverted = False
+  if len(starts) and not boundary.any() and not non_manifold.any():
+    # Fan triangles (first, i, i + 1) of every face
+    first = np.repeat(corners[starts], totals, axis=0)
+    next_loops = np.arange(len(corners)) + 1
+    next_loops[starts + totals - 1] = starts
+    inverted = np.einsum('ij,ij->', first, np.cross(corners, corners[next_loops])) < 0
+  result = (boundary, non_manifold, zero_area, bool(inverted))
+  _readiness_cache[mesh.session_uid] = (data_version(mesh), result)
+  return result
+
+def readiness_report(obj, result):
+  boundary, non_manifold, zero_area, inverted = result
+  problems = [
+    f'{count} {name}' for count, name in (
+      (int(non_manifold.sum()), 'non-manifold edges'),
+      (int(boundary.sum()), 'open boundary edges'),
+      (int(zero_area.sum()), 'zero area faces')
+    ) if count
+  ]
+  if inverted: problems.append('inverted normals')
+  return f'{obj.name}: {", ".join(problems)}' if problems else None
+
+class CheckBooleanReadinessOperator(bpy.types.Operator):
+  """Find non-manifold and open edges, zero area faces and inverted meshes that make booleans fail"""
+  bl_idname = 'qm.check_boolean_readiness'
+  bl_label = 'Check Boolean Readiness'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  select: bpy.props.BoolProperty(name='Select Problems', description='Select the problem edges and faces in edit mode', default=True)
+
+  @classmethod
+  def poll(cls, context):
+    return any(o.type == 'MESH' for o in (context.objects_in_mode if is_in_editmode() else context.selected_objects))
+
+  def execute(self, context):
+    objects = context.objects_in_mode if is_in_editmode() else context.selected_objects
+    reports = []
+    for obj in objects:
+      if obj.type != 'MESH': continue
+      with MeshAccess(obj) as access:
+        result = boolean_readiness(access)
+        report = readiness_report(obj, result)
+        if report: reports.append(report)
+        if self.select and access.is_edit:
+          boundary, non_manifold, zero_area, _ = result
+          edges = boundary | non_manifold
+          vertices = np.zeros(len(access.source.vertices), dtype=bool)
+          vertices[access.edge_vertices()[edges].ravel()] = True
+          vertices[access.loop_vertices()[np.repeat(zero_area, access.loop_totals())]] = True
+          access.set_selection(vertices, edges, zero_area)
+    if reports:
+      self.report({'WARNING'}, '; '.join(reports))
+    else:
+      self.report({'INFO'}, 'Ready for booleans')
+    return {'FINISHED'}
+
 class BooleanOperator(bpy.types.Operator):
   """Boolean"""
   bl_idname = 'qm.boolean'
@@ -26,7 +310,23 @@ class BooleanOperator(bpy.types.Operator):
 
   move_on_top: bpy.props.BoolProperty(name='Move Modifier On Top', default=True)
 
+  check_input: bpy.props.BoolProperty(name='Check Input', description='Warn about non-manifold, open, degenerate or inverted input before running the boolean', default=False)
+
+  use_collection: bpy.props.BoolProperty(name='Collection Operand', description='Move the cutters into a collection used by a single boolean modifier instead of adding a modifier per cutter', default=False)
+
+  def report_readiness(self, context):
+    objects = context.objects_in_mode if is_in_editmode() else context.selected_objects
+    reports = []
+    for obj in objects:
+      if obj.type != 'MESH': continue
+      with MeshAccess(obj) as access:
+        report = readiness_report(obj, boolean_readiness(access))
+      if report: reports.append(report)
+    if reports:
+      self.report({'WARNING'}, '; '.join(reports))
+
   def execute(self, context):
+    if self.check_input: self.report_readiness(context)
     if self.recalculate_normals and is_in_editmode(): bpy.ops.mesh.normals_make_consistent(inside=False)
     if not self.use_self and self.boundary_extend > 0:
       transform_pivot = context.scene.tool_settings.transform_pivot_point
@@ -39,20 +339,91 @@ class BooleanOperator(bpy.types.Operator):
     else:
       active = context.object
       objects = [o for o in context.selected_objects if o != active]
+      if self.use_collection and objects:
+        # One modifier for all of the cutters, later cutters join its collection
+        boolean, collection = cutters_collection(active, self.operation)
+        if boolean is None:
+          boolean = active.modifiers.new(name=BOOLEAN_MODIFIER_NAME, type='BOOLEAN')
+          boolean.operand_type, boolean.collection = 'COLLECTION', collection
+          boolean.operation, boolean.solver = self.operation, self.solver
+          if self.move_on_top:
+            active.modifiers.move(len(active.modifiers) - 1, 0)
+        for obj in objects:
+          move_to_collection(obj, collection)
       for obj in objects:
-        select(active)
-        bpy.ops.object.modifier_add(type='BOOLEAN')
-        boolean = context.object.modifiers[-1]
-        boolean.object, boolean.operation, boolean.solver = obj, self.operation, self.solver
-        if self.move_on_top:
-          move_modifier_on_top(boolean.name)
-        select(obj)
-        context.object.display_type = 'BOUNDS'
-        context.object.hide_render = True
-      bpy.ops.object.select_all(action='DESELECT')
-      for obj in objects: obj.select_set(True)
+        if not self.use_collection:
+          boolean = active.modifiers.new(name=BOOLEAN_MODIFIER_NAME, type='BOOLEAN')
+          boolean.object, boolean.operation, boolean.solver = obj, self.operation, self.solver
+          if self.move_on_top:
+            active.modifiers.move(len(active.modifiers) - 1, 0)
+        obj.display_type = 'BOUNDS'
+        obj.hide_render = True
+      active.select_set(False)
+      if objects: context.view_layer.objects.active = objects[-1]
+    return {'FINISHED'}
+
+class RemoveBooleanCuttersOperator(bpy.types.Operator):
+  """Take the selected cutters out of the collections of collection operand booleans"""
+  bl_idname = 'qm.remove_boolean_cutters'
+  bl_label = 'Remove Boolean Cutters'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  @classmethod
+  def poll(cls, context):
+    parent = bpy.data.collections.get(CUTTERS_COLLECTION_NAME)
+    return parent is not None and len(context.selected_objects) > 0
+
+  def execute(self, context):
+    cutter_collections = set(bpy.data.collections[CUTTERS_COLLECTION_NAME].children)
+    for obj in context.selected_objects:
+      if not cutter_collections.intersection(obj.users_collection): continue
+      move_to_collection(obj, context.collection if context.collection not in cutter_collections else context.scene.collection)
+      obj.display_type = 'TEXTURED'
+      obj.hide_render = False
     return {'FINISHED'}
 
+class BooleanPreviewOperator(bpy.types.Operator):
+  """Choose what happens to Quick Menu booleans while their cutters are being moved"""
+  bl_idname = 'qm.boolean_preview'
+  bl_label = 'Boolean Preview'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  mode: bpy.props.EnumProperty(name='Mode', items=(
+    ('OFF', 'Off', 'Always evaluate booleans with their own solver'),
+    ('FLOAT', 'Float Solver', 'Use the float solver while cutters are being moved'),
+    ('DISABLE', 'Disable', 'Hide booleans in the viewport while cutters are being moved')
+  ))
+
+  def execute(self, context):
+    context.scene.quick_menu.boolean_preview = self.mode
+    if self.mode == 'OFF':
+      restore_booleans_now()
+    return {'FINISHED'}
+
+class BooleanCullingOperator(bpy.types.Operator):
+  """Disable Quick Menu difference booleans whose cutters don't reach the target"""
+  bl_idname = 'qm.boolean_culling'
+  bl_label = 'Boolean Culling'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  mode: bpy.props.EnumProperty(name='Mode', items=(
+    ('AUTO', 'Automatic', 'Cull now and keep updating as targets and cutters move'),
+    ('ONCE', 'Once', 'Cull now only'),
+    ('OFF', 'Off', 'Stop culling and enable all of the culled booleans')
+  ))
+
+  def execute(self, context):
+    context.scene.quick_menu.boolean_culling = self.mode == 'AUTO'
+    if self.mode == 'OFF':
+      uncull_booleans(context.scene.objects)
+      return {'FINISHED'}
+    disabled, enabled = cull_booleans([obj for obj in context.scene.objects if managed_booleans(obj)])
+    self.report({'INFO'}, f'Disabled {disabled} booleans, enabled {enabled}')
+    return {'FINISHED'}
+
+# Upper limit of cuts in one slicing, for tiny spacings on big meshes
+MAX_SLICES = 1000
+
 class PlaneIntersectOperator(bpy.types.Operator):
   """Plane Intersect"""
   bl_idname = 'qm.plane_intersect'
@@ -73,10 +444,31 @@ class PlaneIntersectOperator(bpy.types.Operator):
 
   clear_inner: bpy.props.BoolProperty(name='Clear Inner', default = False)
 
+  cuts: bpy.props.IntProperty(name='Cuts', description='Number of cuts. More than one are spaced evenly through the selection', default = 1, min = 1, soft_max = 100)
+
+  spacing: bpy.props.FloatProperty(name='Spacing', description='Distance between cuts going both ways from the cursor, used instead of the number of cuts when above zero', default = 0, min = 0, subtype='DISTANCE')
+
+  split: bpy.props.EnumProperty(name='Split', default='NONE', items=(
+    ('NONE', 'None', 'Keep the slices connected'),
+    ('ISLANDS', 'Islands', 'Split the slices into separate islands'),
+    ('OBJECTS', 'Objects', 'Split the slices and separate every slice into an object')
+  ))
+
   @classmethod
   def poll(cls, context):
     return is_in_editmode()
 
+  def draw(self, context):
+    l = self.layout
+    for prop in ('mode', 'snap_view_axis', 'active'):
+      l.prop(self.properties, prop)
+    # Clearing a side only means something with a single plane
+    if self.cuts == 1 and self.spacing == 0:
+      l.prop(self.properties, 'clear_outer')
+      l.prop(self.properties, 'clear_inner')
+    for prop in ('cuts', 'spacing', 'split'):
+      l.prop(self.properties, prop)
+
   def execute(self, context):
     vector = view_snapped_vector(False, False) if self.snap_view_axis else view_vector(False, False)
     cursor_to_selected(self.active)
@@ -84,13 +476,119 @@ class PlaneIntersectOperator(bpy.types.Operator):
       bpy.ops.mesh.select_linked(delimit=set())
     elif self.mode == 'MESH':
       bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.mesh.bisect(plane_co=context.scene.cursor.location, plane_no=vector, clear_outer=self.clear_outer, clear_inner=self.clear_inner)
+    if self.cuts == 1 and self.spacing == 0 and self.split == 'NONE':
+      bpy.ops.mesh.bisect(plane_co=context.scene.cursor.location, plane_no=vector, clear_outer=self.clear_outer, clear_inner=self.clear_inner)
+    else:
+      self.slice(context, vector.normalized())
     return {'FINISHED'}
 
+  def slice(self, context, normal):
+    # Every cut of every object in one BMesh session, planes are given by their
+    # distance along the normal
+    meshes = []
+    for obj in context.objects_in_mode:
+      if obj.type != 'MESH' or obj.data.total_vert_sel == 0: continue
+      bm = bmesh.from_edit_mesh(obj.data)
+      geom = [e for elements in (bm.verts, bm.edges, bm.faces) for e in elements if e.select]
+      positions = np.array([v.co for v in geom if isinstance(v, bmesh.types.BMVert)], dtype=np.float64)
+      distances = world_positions(obj, positions) @ np.array(normal)
+      meshes.append((obj, bm, geom, distances.min(), distances.max()))
+    if not meshes: return
+
+    low, high = min(m[3] for m in meshes), max(m[4] for m in meshes)
+    anchor = context.scene.cursor.location.dot(normal)
+    if self.spacing > 0:
+      steps = np.arange(math.floor((low - anchor) / self.spacing), math.ceil((high - anchor) / self.spacing) + 1)
+      offsets = anchor + steps * self.spacing
+      offsets = offsets[(offsets > low) & (offsets < high)]
+    elif self.cuts == 1:
+      offsets = np.array([anchor])
+    else:
+      offsets = low + (high - low) * np.arange(1, self.cuts + 1) / (self.cuts + 1)
+    if len(offsets) > MAX_SLICES:
+      self.report({'WARNING'}, f'Limited to {MAX_SLICES} cuts')
+      offsets = offsets[:MAX_SLICES]
+
+    single = self.cuts == 1 and self.spacing == 0
+    sliced = []
+    for obj, bm, geom, _, _ in meshes:
+      inverse = obj.matrix_world.inverted()
+      local_normal = (obj.matrix_world.to_3x3().transposed() @ normal).normalized()
+      cut_edges = []
+      for offset in offsets.tolist():
+        result = bmesh.ops.bisect_plane(
+          bm, geom=geom, dist=0.0001, plane_co=inverse @ (normal * offset), plane_no=local_normal,
+          clear_outer=single and self.clear_outer, clear_inner=single and self.clear_inner
+        )
+        geom = result['geom']
+        cut_edges += [e for e in result['geom_cut'] if isinstance(e, bmesh.types.BMEdge)]
+      cut_edges = [e for e in cut_edges if e.is_valid]
+      for edge in cut_edges: edge.select = True
+      if self.split != 'NONE':
+        bmesh.ops.split_edges(bm, edges=cut_edges)
+      faces = [f for f in geom if isinstance(f, bmesh.types.BMFace) and f.is_valid]
+      if self.split == 'OBJECTS' and faces:
+        centers = np.array([f.calc_center_median() for f in faces], dtype=np.float64)
+        sliced.append((obj, faces, np.searchsorted(offsets, world_positions(obj, centers) @ np.array(normal))))
+      bmesh.update_edit_mesh(obj.data)
+    if sliced:
+      self.separate_slices(sliced, len(offsets) + 1)
+
+  def separate_slices(self, sliced, count):
+    # Separate every slice but the first into its own object, one slice of all
+    # objects at a time. Geometry outside the sliced selection stays where it is
+    slices = []
+    for obj, faces, labels in sliced:
+      bm = bmesh.from_edit_mesh(obj.data)
+      for elements in (bm.verts, bm.edges, bm.faces):
+        for element in elements: element.select = False
+      order = np.argsort(labels, kind='stable')
+      bounds = np.searchsorted(labels[order], np.arange(count + 1)).tolist()
+      slices.append((obj, [[faces[i] for i in order[bounds[k]:bounds[k + 1]].tolist()] for k in range(count)]))
+    for k in range(1, count):
+      selected = False
+      for obj, faces in slices:
+        if not faces[k]: continue
+        for face in faces[k]: face.select_set(True)
+        bmesh.update_edit_mesh(obj.data)
+        selected = True
+      if selected: bpy.ops.mesh.separate(type='SELECTED')
+    for obj, faces in slices:
+      for face in faces[0]: face.select_set(True)
+      bmesh.update_edit_mesh(obj.data)
+
+_restore_handlers = (
+  bpy.app.handlers.render_init,
+  bpy.app.handlers.save_pre,
+  bpy.app.handlers.load_pre,
+  bpy.app.handlers.undo_post,
+  bpy.app.handlers.redo_post
+)
+
 def register():
+  bpy.app.handlers.depsgraph_update_post.append(preview_booleans)
+  bpy.app.handlers.depsgraph_update_post.append(recull_booleans)
+  for handlers in _restore_handlers:
+    handlers.append(restore_booleans_now)
+  bpy.utils.register_class(CheckBooleanReadinessOperator)
   bpy.utils.register_class(BooleanOperator)
+  bpy.utils.register_class(RemoveBooleanCuttersOperator)
+  bpy.utils.register_class(BooleanPreviewOperator)
+  bpy.utils.register_class(BooleanCullingOperator)
   bpy.utils.register_class(PlaneIntersectOperator)
 
 def unregister():
+  restore_booleans_now()
+  if preview_booleans in bpy.app.handlers.depsgraph_update_post:
+    bpy.app.handlers.depsgraph_update_post.remove(preview_booleans)
+  if recull_booleans in bpy.app.handlers.depsgraph_update_post:
+    bpy.app.handlers.depsgraph_update_post.remove(recull_booleans)
+  for handlers in _restore_handlers:
+    if restore_booleans_now in handlers:
+      handlers.remove(restore_booleans_now)
+  bpy.utils.unregister_class(CheckBooleanReadinessOperator)
   bpy.utils.unregister_class(BooleanOperator)
+  bpy.utils.unregister_class(RemoveBooleanCuttersOperator)
+  bpy.utils.unregister_class(BooleanPreviewOperator)
+  bpy.utils.unregister_class(BooleanCullingOperator)
   bpy.utils.unregister_class(PlaneIntersectOperator)
\ No newline at end of file
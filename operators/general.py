@@ -116,14 +116,15 @@ class SetOriginOperator(bpy.types.Operator):
     elif self.type == 'BOTTOM':
       def fn():
         objects = context.selected_objects
+        # Both operators work on the whole selection at once
+        bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+        bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
+        context.view_layer.update()
         for obj in objects:
-          select(obj)
-          bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-          bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
+          if obj.data is None: continue
           new_origin = Vector((0, 0, -obj.dimensions.z / 2))
           obj.data.transform(Matrix.Translation(-new_origin))
           obj.location += new_origin
-        for obj in objects: obj.select_set(True)
     execute_in_object_mode(fn)
     return {'FINISHED'}
 
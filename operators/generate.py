@@ -21,10 +21,16 @@ class MirrorOperator(bpy.types.Operator):
     l.row().prop(self.properties, 'bisect_flip', toggle=1)
 
   def execute(self, context):
-    if modifier_exists('MIRROR'):
-      m = add_or_get_modifier('QMMirror', 'MIRROR')
-      fn = lambda: bpy.ops.object.modifier_apply(modifier=m.name)
-      execute_in_object_mode(fn)
+    is_mirror = lambda m: m.type == 'MIRROR' and is_quick_menu_modifier(m)
+    if any(is_mirror(m) for m in context.object.modifiers):
+      # Apply the Quick Menu mirror of every selected object that has one
+      objects = [o for o in context.selected_objects if o.type == 'MESH' and any(is_mirror(m) for m in o.modifiers)]
+      skipped = [o.name for o in objects if o.data.shape_keys or not any(m.show_viewport and is_mirror(m) for m in o.modifiers)]
+      apply = lambda: apply_modifiers(objects, is_mirror)
+      if is_in_editmode(): execute_in_object_mode(apply)
+      else: apply()
+      if skipped:
+        self.report({'WARNING'}, f'Skipped objects with shape keys or hidden mirrors: {", ".join(skipped)}')
       return {'FINISHED'}
     m = add_or_get_modifier('QMMirror', 'MIRROR', move_on_top=True)
     m.use_axis[0], m.show_on_cage = False, True
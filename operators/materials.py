@@ -1,6 +1,6 @@
-import bpy, bmesh, math
+import bpy, bmesh, math, re, json
+import numpy as np
 from mathutils import Vector, Matrix
-from functools import reduce
 from .. common.common import *
 
 class StraightenUVsOperator(bpy.types.Operator):
@@ -9,50 +9,197 @@ class StraightenUVsOperator(bpy.types.Operator):
   bl_label = 'Straighten UVs'
   bl_options = {'REGISTER', 'UNDO'}
 
+  every_island: bpy.props.BoolProperty(name='Every Island', description='Straighten every selected UV island of all objects in edit mode, not only the island of the active face', default=False)
+
+  edge_length_mode: bpy.props.EnumProperty(name='Edge Length Mode', default='LENGTH_AVERAGE', items=(
+    ('EVEN', 'Even', 'Space all UVs evenly'),
+    ('LENGTH', 'Length', 'Follow the length of every edge'),
+    ('LENGTH_AVERAGE', 'Length Average', 'Follow the average length of every edge ring')
+  ))
+
   @classmethod
   def poll(cls, context):
     return is_in_editmode()
 
-  def execute(self, context):
-    mesh = context.object.data
-    selection_indeces, active_indeces = execute_in_edit_mode(get_selection_and_active_indices)
+  def straighten(self, access, quads, references):
+    uvs = access.uvs()
+    loops, values = follow_quads(access, uvs, quads, references, self.edge_length_mode)
+    access.set_uvs(values, loops)
 
-    # Show an error if nothing is selected
-    if len(selection_indeces) == 0:
-      self.report({'ERROR'}, 'Nothing is selected')
+  def execute(self, context):
+    if self.every_island:
+      # The reference of every island is its first quad, or the active face if it's in there
+      for obj in context.objects_in_mode:
+        if obj.type != 'MESH' or not obj.data.uv_layers: continue
+        with MeshAccess(obj) as access:
+          faces = np.flatnonzero(access.face_selection())
+          quads = faces[access.loop_totals()[faces] == 4]
+          if len(quads) == 0: continue
+          islands = uv_islands(access, quads, access.uvs())
+          references = np.unique(islands, return_index=True)[1]
+          active = np.flatnonzero(quads == access.active_face_index())
+          if len(active):
+            references[islands[active[0]]] = active[0]
+          self.straighten(access, quads, references)
       return {'FINISHED'}
 
-    # Show an error if nothing is active
-    if len(active_indeces) == 0:
-      self.report({'ERROR'}, 'Nothing is active. Please make sure you have an active face')
-      return {'FINISHED'}
+    with MeshAccess(context.object) as access:
+      faces = np.flatnonzero(access.face_selection())
 
-    def process_uvs():
-      # Reorder active indices to ensure clockwise order
-      active_uv = mesh.uv_layers.active.data
-      center_x = sum(active_uv[i].uv.x for i in active_indeces) / len(active_indeces)
-      center_y = sum(active_uv[i].uv.y for i in active_indeces) / len(active_indeces)
-      active_indeces.sort(key=lambda i: math.atan2(active_uv[i].uv.y - center_y, active_uv[i].uv.x - center_x) % (2 * math.pi))
-
-      # Align UV vertices for the active quad
-      prev_uv_coords = first_axis = None
-      for iteration_index, index in enumerate([*active_indeces, active_indeces[0]]):
-        uv_coords = mesh.uv_layers.active.data[index].uv
-        if prev_uv_coords:
-          if first_axis == None:
-            diff = uv_coords - prev_uv_coords
-            diff_abs = [abs(diff.x), abs(diff.y)]
-            min_axis = diff_abs.index(min(diff_abs))
-            first_axis = min_axis
-          else:
-            min_axis = (first_axis + iteration_index + 1) % 2
-          uv_coords[min_axis] = prev_uv_coords[min_axis]
-        prev_uv_coords = uv_coords
-
-    execute_in_object_mode(process_uvs)
-    bpy.ops.uv.follow_active_quads()
+      # Show an error if nothing is selected
+      if len(faces) == 0:
+        self.report({'ERROR'}, 'Nothing is selected')
+        return {'FINISHED'}
+
+      # Show an error if nothing is active
+      active = access.active_face_index()
+      if active not in faces:
+        self.report({'ERROR'}, 'Nothing is active. Please make sure you have an active face')
+        return {'FINISHED'}
+
+      if access.loop_totals()[active] != 4:
+        self.report({'ERROR'}, 'Active face must be a quad')
+        return {'FINISHED'}
+
+      if not context.object.data.uv_layers:
+        self.report({'ERROR'}, 'Mesh has no UV map')
+        return {'FINISHED'}
+
+      quads = faces[access.loop_totals()[faces] == 4]
+      self.straighten(access, quads, np.flatnonzero(quads == active))
     return {'FINISHED'}
 
+# Seconds without seam edits before a deferred unwrap runs
+UNWRAP_DELAY = 0.5
+
+# Faces next to seams changed since the last unwrap, by object name, with the
+# face count they were recorded for
+_pending_unwraps = {}
+
+def _changed_seam_faces(access, seams_before):
+  changed = np.flatnonzero(access.edge_seams() != seams_before)
+  loops = np.flatnonzero(np.isin(access.loop_edges(), changed))
+  return np.unique(np.searchsorted(access.loop_starts(), loops, side='right') - 1)
+
+def _fit_to_bounds(uvs, before, labels):
+  # Scale and move every labelled island back into the UV bounds it had before,
+  # keeping its aspect. Islands that had no UV area before stay where they are
+  count = labels.max() + 1
+  bounds = []
+  for values in (before, uvs):
+    low, high = np.full((count, 2), np.inf), np.full((count, 2), -np.inf)
+    np.minimum.at(low, labels, values)
+    np.maximum.at(high, labels, values)
+    bounds.append((low, high - low))
+  (old_low, old_size), (new_low, new_size) = bounds
+  ratios = np.divide(old_size, new_size, out=np.full_like(old_size, np.inf), where=new_size > 0)
+  scale = ratios.min(axis=1)
+  keep = ~np.isfinite(scale) | (old_size.max(axis=1) <= 0)
+  scale[keep] = 1
+  old_low[keep] = new_low[keep]
+  return old_low[labels] + (uvs - new_low[labels]) * scale[labels, None]
+
+def _unwrap_islands(pending):
+  # Select only the seam islands around the changed seams of the pending objects
+  # in edit mode, unwrap them in place of their old UVs and put the selection
+  # back. Other objects in edit mode only get their faces deselected
+  selections, unwrapped = [], []
+  for obj in bpy.context.objects_in_mode:
+    if obj.type != 'MESH': continue
+    with MeshAccess(obj) as access:
+      selections.append((obj, access.vertex_selection(), access.edge_selection(), access.face_selection()))
+      faces = np.zeros(len(access.source.polygons), dtype=bool)
+      if obj.name not in pending:
+        access.set_face_selection(faces)
+        continue
+      islands = mesh_islands(access, np.arange(len(faces)), delimit_seams=True)
+      face_count, changed = pending[obj.name]
+      if face_count == len(faces):
+        faces = np.isin(islands, islands[changed])
+      else:
+        # Topology changed since, the recorded faces mean nothing anymore
+        faces[:] = True
+      faces &= ~access.face_hidden()
+      access.set_face_selection(faces)
+      uvs = access.uvs()
+      if uvs is not None and faces.any():
+        faces = np.flatnonzero(faces)
+        totals = access.loop_totals()
+        loops = face_loop_indices(access.loop_starts(), totals, faces)
+        labels = np.unique(islands[faces], return_inverse=True)[1].reshape(-1)
+        unwrapped.append((obj, loops, np.repeat(labels, totals[faces]), uvs[loops]))
+  # Unwrapping packs the islands into the 0-1 square over the other islands
+  bpy.ops.uv.unwrap()
+  for obj, loops, labels, before in unwrapped:
+    with MeshAccess(obj) as access:
+      access.set_uvs(_fit_to_bounds(access.uvs()[loops], before, labels), loops)
+  for obj, vertices, edges, faces in selections:
+    with MeshAccess(obj) as access:
+      access.set_selection(vertices, edges, faces)
+
+def _unwrap_after_edit_mode(objects, pending):
+  # Objects that just left edit mode with unwraps pending go back into it
+  # together once, the selection and the active object are put back after
+  view_layer = bpy.context.view_layer
+  active = view_layer.objects.active
+  selected = [o for o in view_layer.objects if o.select_get()]
+  for obj in selected: obj.select_set(False)
+  for obj in objects: obj.select_set(True)
+  view_layer.objects.active = objects[0]
+  bpy.ops.object.mode_set(mode='EDIT')
+  try:
+    _unwrap_islands(pending)
+  finally:
+    bpy.ops.object.mode_set(mode='OBJECT')
+    for obj in objects: obj.select_set(False)
+    for obj in selected: obj.select_set(True)
+    view_layer.objects.active = active
+
+def flush_unwraps():
+  # Unwrap pending objects in edit mode where they are, and the ones that left
+  # edit mode right after it. From other modes unwraps wait for the next edit
+  for name in [name for name in _pending_unwraps if name not in bpy.data.objects]:
+    del _pending_unwraps[name]
+  with window_override():
+    view_layer = bpy.context.view_layer
+    objects = [o for o in map(bpy.data.objects.get, _pending_unwraps) if o.name in view_layer.objects]
+    if is_in_editmode():
+      objects = [o for o in objects if o.mode == 'EDIT']
+    elif bpy.context.mode == 'OBJECT':
+      objects = [o for o in objects if o.visible_get()]
+    else:
+      objects = []
+    pending = {obj.name: _pending_unwraps.pop(obj.name) for obj in objects}
+    if not pending:
+      return None
+    if is_in_editmode():
+      _unwrap_islands(pending)
+    else:
+      _unwrap_after_edit_mode(objects, pending)
+    if not bpy.app.background:
+      bpy.ops.ed.undo_push(message='Unwrap')
+  return None
+
+def schedule_unwrap(delay = UNWRAP_DELAY):
+  if bpy.app.timers.is_registered(flush_unwraps):
+    bpy.app.timers.unregister(flush_unwraps)
+  bpy.app.timers.register(flush_unwraps, first_interval=delay)
+
+@bpy.app.handlers.persistent
+def unwrap_on_mode_change(scene, depsgraph):
+  # Don't wait for the delay when an object with pending unwraps leaves edit
+  # mode, and pick up unwraps left over when it enters edit mode again
+  for name in _pending_unwraps:
+    obj = bpy.data.objects.get(name)
+    if obj is None: continue
+    if obj.mode != 'EDIT' or not bpy.app.timers.is_registered(flush_unwraps):
+      schedule_unwrap(0)
+      return
+
+@bpy.app.handlers.persistent
+def clear_pending_unwraps(*args):
+  _pending_unwraps.clear()
+
 class MarkSeamOperator(bpy.types.Operator):
   """Mark Or Clear Seam. Hold shift to clear seam"""
   bl_idname = 'qm.mark_seam'
@@ -65,6 +212,8 @@ class MarkSeamOperator(bpy.types.Operator):
 
   unwrap: bpy.props.BoolProperty(name='Unwrap', default=True)
 
+  deferred: bpy.props.BoolProperty(name='Deferred', description='Unwrap only the affected islands once seam edits stop, instead of the whole mesh on every edit', default=False)
+
   @classmethod
   def poll(cls, context):
     return is_in_editmode()
@@ -73,15 +222,10 @@ class MarkSeamOperator(bpy.types.Operator):
     if event.shift: self.clear = True
     return self.execute(context)
 
-  def execute(self, context):
-    if self.unwrap:
-      unwrap_previous_value = bpy.context.scene.tool_settings.use_edge_path_live_unwrap
-      bpy.context.scene.tool_settings.use_edge_path_live_unwrap = True
+  def mark_seam(self, context):
     if self.clear:
       bpy.ops.mesh.mark_seam(clear=True)
-      if self.unwrap:
-        bpy.context.scene.tool_settings.use_edge_path_live_unwrap = unwrap_previous_value
-      return {'FINISHED'}
+      return
     mode = tuple(context.scene.tool_settings.mesh_select_mode).index(True)
     if self.clear_inner_region: bpy.ops.mesh.mark_seam(clear=True)
     if mode == 1: bpy.ops.mesh.mark_seam()
@@ -90,8 +234,42 @@ class MarkSeamOperator(bpy.types.Operator):
       bpy.ops.mesh.mark_seam()
       bpy.ops.mesh.loop_to_region()
       bpy.ops.mesh.select_mode(use_extend=False, use_expand=False, type='FACE')
-    if self.unwrap:
-      bpy.context.scene.tool_settings.use_edge_path_live_unwrap = unwrap_previous_value
+
+  def execute(self, context):
+    if not self.unwrap:
+      self.mark_seam(context)
+      return {'FINISHED'}
+
+    tool_settings = context.scene.tool_settings
+    unwrap_previous_value = tool_settings.use_edge_path_live_unwrap
+    tool_settings.use_edge_path_live_unwrap = not self.deferred
+    if self.deferred:
+      seams_before = {}
+      for obj in context.objects_in_mode:
+        if obj.type != 'MESH': continue
+        with MeshAccess(obj) as access:
+          seams_before[obj] = access.edge_seams()
+    self.mark_seam(context)
+    tool_settings.use_edge_path_live_unwrap = unwrap_previous_value
+    if not self.deferred:
+      return {'FINISHED'}
+
+    # Remember the faces next to the changed seams and unwrap their islands later
+    for obj, seams in seams_before.items():
+      with MeshAccess(obj) as access:
+        faces = _changed_seam_faces(access, seams)
+        face_count = len(access.source.polygons)
+      if len(faces) == 0: continue
+      previous = _pending_unwraps.get(obj.name)
+      if previous is not None and previous[0] == face_count:
+        faces = np.union1d(previous[1], faces)
+      _pending_unwraps[obj.name] = (face_count, faces)
+
+    # Without a UI there are no timers to run on, unwrap right away
+    if bpy.app.background:
+      flush_unwraps()
+    elif _pending_unwraps:
+      schedule_unwrap()
     return {'FINISHED'}
 
 class SmartUVProject(bpy.types.Operator):
@@ -111,12 +289,45 @@ class SmartUVProject(bpy.types.Operator):
     bpy.ops.uv.seams_from_islands()
     return {'FINISHED'} 
 
+# Island labels of the last transformed selection per mesh, keyed by a digest of
+# the selected corners, so redo tweaks don't detect the same islands again
+_uv_island_cache = {}
+
+def cached_uv_islands(access, faces, uvs):
+  loops = face_loop_indices(access.loop_starts(), access.loop_totals(), faces)
+  digest = hash((faces.tobytes(), access.loop_vertices()[loops].tobytes(), uvs[loops].tobytes()))
+  cached = _uv_island_cache.get(access.mesh.session_uid)
+  if cached is None or cached[0] != digest:
+    cached = _uv_island_cache[access.mesh.session_uid] = (digest, uv_islands(access, faces, uvs))
+  return cached[1]
+
+def uv_pivots(uvs, labels, count, pivot):
+  # Median or bounding box center of the UVs of every label
+  if pivot == 'BOUNDS':
+    low, high = np.full((count, 2), np.inf), np.full((count, 2), -np.inf)
+    np.minimum.at(low, labels, uvs)
+    np.maximum.at(high, labels, uvs)
+    return (low + high) / 2
+  sums = np.zeros((count, 2))
+  np.add.at(sums, labels, uvs)
+  return sums / np.bincount(labels, minlength=count)[:, None]
+
 class TransformUVsOperator(bpy.types.Operator):
   """Transform UV"""
   bl_idname = 'qm.transform_uvs'
   bl_label = 'Transform UVs'
   bl_options = {'REGISTER', 'UNDO'}
 
+  mode: bpy.props.EnumProperty(name='Mode', items=(
+    ('SELECTION', 'Selection', 'Transform the whole selection around one center'),
+    ('ISLANDS', 'Islands', 'Transform every UV island of the selection around its own center')
+  ))
+
+  pivot: bpy.props.EnumProperty(name='Pivot', items=(
+    ('MEDIAN', 'Median', 'Average of the UV coordinates'),
+    ('BOUNDS', 'Bounding Box Center', 'Center of the UV bounding box')
+  ))
+
   offset_x: bpy.props.FloatProperty(name='Offset X', default=0, step=0.1)
 
   offset_y: bpy.props.FloatProperty(name='Offset Y', default=0, step=0.1)
@@ -131,30 +342,417 @@ class TransformUVsOperator(bpy.types.Operator):
   def poll(cls, context):
     return is_in_editmode() and anything_is_selected_in_editmode()
 
+  def matrix(self):
+    # Rotation followed by scale, applied to UVs relative to the center
+    cos, sin = math.cos(self.rotation), math.sin(self.rotation)
+    return np.array(((self.scale_x, 0), (0, self.scale_y))) @ np.array(((cos, -sin), (sin, cos)))
+
+  def execute(self, context):
+    meshes = []
+    label_count = 0
+    try:
+      # Gather the selected UVs across all of the objects first. Every selected
+      # loop gets a label of the group it's transformed with
+      for obj in context.objects_in_mode:
+        if obj.type != 'MESH': continue
+        access = MeshAccess(obj)
+        faces = np.flatnonzero(access.face_selection())
+        totals = access.loop_totals()
+        selection_indeces = face_loop_indices(access.loop_starts(), totals, faces)
+        uvs = access.uvs()
+        if uvs is None:
+          uvs = np.zeros((len(access.source.loops), 2), dtype=np.float32)
+        if self.mode == 'ISLANDS' and len(faces):
+          islands = cached_uv_islands(access, faces, uvs)
+          labels = label_count + np.repeat(islands, totals[faces])
+          label_count += islands.max() + 1
+        else:
+          labels = np.zeros(len(selection_indeces), dtype=np.int64)
+        meshes.append((access, selection_indeces, uvs[selection_indeces], labels))
+
+      selected = [mesh for mesh in meshes if len(mesh[1])]
+      if not selected:
+        return {'FINISHED'}
+
+      # One batched affine transform for all of the objects, around the center
+      # of each group: the whole selection or every island
+      all_uvs = np.concatenate([uvs for _, _, uvs, _ in selected])
+      all_labels = np.concatenate([labels for _, _, _, labels in selected])
+      centers = uv_pivots(all_uvs, all_labels, max(label_count, 1), self.pivot)[all_labels]
+      offset = np.array((self.offset_x, self.offset_y))
+      transformed = (all_uvs + offset - centers) @ self.matrix().T + centers
+
+      start = 0
+      for access, selection_indeces, _, _ in selected:
+        end = start + len(selection_indeces)
+        access.set_uvs(transformed[start:end], selection_indeces)
+        start = end
+    finally:
+      for access, _, _, _ in meshes:
+        access.release()
+    return {'FINISHED'}
+
+# Per face world space area, UV area and UV island of objects, each valid for one
+# data version of the mesh, UV map and transform
+_texel_cache = {}
+
+def texel_data(obj, access):
+  key = (data_version(obj.data), obj.data.uv_layers.active.name, tuple(map(tuple, obj.matrix_world)))
+  cached = _texel_cache.get(obj.session_uid)
+  if cached is None or cached[0] != key:
+    starts, totals = access.loop_starts(), access.loop_totals()
+    matrix = np.array(obj.matrix_world)
+    positions = access.vertex_positions() @ matrix[:3, :3].T + matrix[:3, 3]
+    uvs = access.uvs()
+    world_areas = polygon_areas(positions[access.loop_vertices()], starts, totals)
+    uv_areas = polygon_areas(uvs, starts, totals)
+    islands = uv_islands(access, np.arange(len(starts)), uvs)
+    cached = _texel_cache[obj.session_uid] = (key, world_areas, uv_areas, islands)
+  return cached[1:]
+
+def texel_density(world_areas, uv_areas, texture_size):
+  # Pixels per meter, zero where there's no surface
+  return np.sqrt(np.divide(uv_areas, world_areas, out=np.zeros(len(uv_areas)), where=world_areas > 0)) * texture_size
+
+def texel_objects(context):
+  # Objects with UVs to work on, one per mesh. In edit mode only the islands of the
+  # selected faces count, in object mode every face of the selected objects
+  objects = context.objects_in_mode if is_in_editmode() else context.selected_objects
+  meshes = {}
+  for obj in objects:
+    if obj.type == 'MESH' and obj.data.uv_layers:
+      meshes.setdefault(obj.data, obj)
+  return list(meshes.values())
+
+def texel_islands(access, islands):
+  # Mask of the islands in scope
+  in_scope = np.zeros(islands.max() + 1 if len(islands) else 0, dtype=bool)
+  in_scope[islands[access.face_selection()] if access.is_edit else islands] = True
+  return in_scope
+
+class MeasureTexelDensityOperator(bpy.types.Operator):
+  """Report the texel density of the selected objects (or of the islands of the selected faces in edit mode)"""
+  bl_idname = 'qm.measure_texel_density'
+  bl_label = 'Measure Texel Density'
+
+  texture_size: bpy.props.IntProperty(name='Texture Size', default=1024, min=1)
+
+  @classmethod
+  def poll(cls, context):
+    return len(texel_objects(context)) > 0
+
+  def execute(self, context):
+    object_densities, island_densities = [], []
+    world_total = uv_total = 0
+    for obj in texel_objects(context):
+      with MeshAccess(obj) as access:
+        world_areas, uv_areas, islands = texel_data(obj, access)
+        in_scope = texel_islands(access, islands)
+      island_world = np.bincount(islands, world_areas, len(in_scope))[in_scope]
+      island_uv = np.bincount(islands, uv_areas, len(in_scope))[in_scope]
+      if island_world.sum() == 0: continue
+      island_densities.append(texel_density(island_world, island_uv, self.texture_size)[island_world > 0])
+      object_densities.append(texel_density(island_world.sum(keepdims=True), island_uv.sum(keepdims=True), self.texture_size))
+      world_total += island_world.sum()
+      uv_total += island_uv.sum()
+
+    if not object_densities:
+      self.report({'WARNING'}, 'Nothing to measure')
+      return {'CANCELLED'}
+
+    density = texel_density(np.array([world_total]), np.array([uv_total]), self.texture_size)[0]
+    object_densities, island_densities = np.concatenate(object_densities), np.concatenate(island_densities)
+    self.report({'INFO'}, f'Texel density {density:.1f} px/m. '
+      f'Objects: {object_densities.min():.1f} - {object_densities.max():.1f} px/m, '
+      f'islands: {island_densities.min():.1f} - {island_densities.max():.1f} px/m')
+    return {'FINISHED'}
+
+class SetTexelDensityOperator(bpy.types.Operator):
+  """Scale UV islands of the selected objects (or the islands of the selected faces in edit mode) to a texel density"""
+  bl_idname = 'qm.set_texel_density'
+  bl_label = 'Set Texel Density'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  density: bpy.props.FloatProperty(name='Density', description='Pixels per meter', default=512, min=0.001)
+
+  texture_size: bpy.props.IntProperty(name='Texture Size', default=1024, min=1)
+
+  mode: bpy.props.EnumProperty(name='Mode', items=(
+    ('ISLANDS', 'Islands', 'Scale every island to the density on its own'),
+    ('OBJECTS', 'Objects', 'Scale all islands of an object by the same factor, keeping their relative density')
+  ))
+
+  @classmethod
+  def poll(cls, context):
+    return len(texel_objects(context)) > 0
+
   def execute(self, context):
-    me = bpy.context.edit_object.data
-    bm = bmesh.from_edit_mesh(me)
-    uv_layer = bm.loops.layers.uv.verify()
-    uvs = []
-    for face in bm.faces:
-      if face.select:
-        center = face.calc_center_median()
-        for loop in face.loops:
-          uvs.append(loop[uv_layer])
-    center = reduce(lambda a, b: a + b, [uv.uv for uv in uvs]) / len(uvs)
-
-    for uv in uvs:
-      if self.offset_x or self.offset_y:
-        uv.uv += Vector( (self.offset_x, self.offset_y) )
-      if self.rotation:
-        rotation_matrix = Matrix.Rotation(self.rotation, 2)
-        offset_uv = uv.uv - center
-        offset_uv.rotate(rotation_matrix)
-        uv.uv = center + offset_uv
-      if self.scale_x != 1 or self.scale_y != 1:
-        uv.uv = center + Vector(uv.uv - center) * Vector((self.scale_x, self.scale_y))
-
-    bmesh.update_edit_mesh(me)
+    for obj in texel_objects(context):
+      with MeshAccess(obj) as access:
+        world_areas, uv_areas, islands = texel_data(obj, access)
+        in_scope = texel_islands(access, islands)
+        island_world = np.bincount(islands, world_areas, len(in_scope))
+        island_uv = np.bincount(islands, uv_areas, len(in_scope))
+        if self.mode == 'OBJECTS':
+          densities = texel_density(island_world[in_scope].sum(keepdims=True), island_uv[in_scope].sum(keepdims=True), self.texture_size)
+          densities = np.repeat(densities, len(in_scope))
+        else:
+          densities = texel_density(island_world, island_uv, self.texture_size)
+        in_scope &= densities > 0
+        if not in_scope.any(): continue
+        factors = np.divide(self.density, densities, out=np.ones(len(densities)), where=in_scope)
+
+        # Scale every island around its bounding box center
+        loop_islands = np.repeat(islands, access.loop_totals())
+        loops = np.flatnonzero(in_scope[loop_islands])
+        uvs = access.uvs()[loops]
+        scoped, labels = np.unique(loop_islands[loops], return_inverse=True)
+        centers = uv_pivots(uvs, labels, len(scoped), 'BOUNDS')[labels]
+        access.set_uvs(centers + (uvs - centers) * factors[scoped][labels][:, None], loops)
+    return {'FINISHED'}
+
+# Properties that don't change how a material renders
+HASH_IGNORED_PROPERTIES = {
+  'rna_type', 'name', 'name_full', 'label', 'location', 'location_absolute', 'width', 'height',
+  'dimensions', 'select', 'parent', 'color', 'use_custom_color', 'show_options', 'show_preview',
+  'show_texture', 'hide', 'session_uid', 'is_evaluated', 'original', 'users', 'use_fake_user',
+  'use_extra_user', 'tag', 'is_runtime_data', 'is_embedded_data', 'is_missing', 'is_editmode',
+  'preview', 'preview_render_type', 'paint_active_slot', 'asset_data', 'override_library',
+  'library_weak_reference', 'is_library_indirect', 'id_type', 'bl_description', 'bl_icon'
+}
+
+def _freeze(value):
+  if isinstance(value, set):
+    return tuple(sorted(value))
+  if isinstance(value, str) or not hasattr(value, '__len__'):
+    return value
+  return tuple(_freeze(v) for v in value)
+
+def _rna_values(struct, memo, depth = 0):
+  values = []
+  for prop in struct.bl_rna.properties:
+    identifier = prop.identifier
+    if identifier in HASH_IGNORED_PROPERTIES or prop.type == 'COLLECTION': continue
+    value = getattr(struct, identifier, None)
+    if prop.type == 'POINTER' and value is not None:
+      if isinstance(value, bpy.types.NodeTree):
+        value = _node_tree_hash(value, memo)
+      elif isinstance(value, bpy.types.ID):
+        value = value.session_uid
+      elif depth < 2:
+        value = _rna_values(value, memo, depth + 1)
+      else: continue
+    values.append((identifier, _freeze(value)))
+  return tuple(values)
+
+def _node_tree_hash(tree, memo):
+  # Nodes with their settings and input values, and links, memoized per tree
+  # so that nested groups are hashed once
+  if tree.session_uid in memo:
+    return memo[tree.session_uid]
+  sockets = lambda collection: tuple((s.identifier, _freeze(getattr(s, 'default_value', None))) for s in collection)
+  nodes = tuple(
+    (node.bl_idname, node.name, _rna_values(node, memo), sockets(node.inputs), sockets(node.outputs))
+    for node in sorted(tree.nodes, key=lambda node: node.name)
+  )
+  links = tuple(sorted(
+    (l.from_node.name, l.from_socket.identifier, l.to_node.name, l.to_socket.identifier, l.is_muted)
+    for l in tree.links
+  ))
+  memo[tree.session_uid] = hash((tree.bl_idname, nodes, links))
+  return memo[tree.session_uid]
+
+# Structural hash of every material, valid while neither the material nor any
+# node group changes
+_material_hashes = {}
+
+def node_groups_version():
+  return sum(data_version(group)[1] for group in bpy.data.node_groups)
+
+def material_hash(material, memo, groups_version):
+  key = (data_version(material), groups_version)
+  cached = _material_hashes.get(material.session_uid)
+  if cached is None or cached[0] != key:
+    cached = _material_hashes[material.session_uid] = (key, hash(_rna_values(material, memo)))
+  return cached[1]
+
+def canonical_material(materials):
+  # Prefer names without a numeric suffix like .001, then the shortest one
+  return min(materials, key=lambda m: (re.search(r'\.\d{3}$', m.name) is not None, len(m.name), m.name))
+
+class DeduplicateMaterialsOperator(bpy.types.Operator):
+  """Replace identical copies of materials (like Material.001) with one of them"""
+  bl_idname = 'qm.deduplicate_materials'
+  bl_label = 'Deduplicate Materials'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  scope: bpy.props.EnumProperty(name='Scope', items=(
+    ('SELECTED', 'Selected Objects', 'Materials of the selected objects'),
+    ('ALL', 'All', 'All of the materials in the file')
+  ))
+
+  dry_run: bpy.props.BoolProperty(name='Dry Run', description='Only report what would be merged', default=False)
+
+  remove: bpy.props.BoolProperty(name='Remove Duplicates', description='Delete the duplicates once they have no users', default=True)
+
+  def execute(self, context):
+    if self.scope == 'SELECTED':
+      materials = {slot.material for obj in context.selected_objects for slot in obj.material_slots if slot.material}
+    else:
+      materials = set(bpy.data.materials)
+
+    memo = {}
+    groups_version = node_groups_version()
+    groups = {}
+    for material in materials:
+      if material.library is None:
+        groups.setdefault(material_hash(material, memo, groups_version), []).append(material)
+
+    remaps = []
+    for group in groups.values():
+      if len(group) < 2: continue
+      canonical = canonical_material(group)
+      remaps += [(material, canonical) for material in group if material != canonical]
+
+    if not remaps:
+      self.report({'INFO'}, 'No duplicate materials')
+      return {'FINISHED'}
+
+    summary = ', '.join(f'{m.name} -> {c.name}' for m, c in remaps[:5]) + (', ...' if len(remaps) > 5 else '')
+    if self.dry_run:
+      self.report({'INFO'}, f'Would merge {len(remaps)} materials: {summary}')
+      return {'FINISHED'}
+
+    for material, canonical in remaps:
+      material.user_remap(canonical)
+    if self.remove:
+      bpy.data.batch_remove([material for material, _ in remaps if material.users == 0])
+    self.report({'INFO'}, f'Merged {len(remaps)} materials: {summary}')
+    return {'FINISHED'}
+
+def unique_materials(objects):
+  # Every material of the objects once, however many slots and objects share it
+  return list(dict.fromkeys(slot.material for obj in objects for slot in obj.material_slots if slot.material))
+
+class MaterialEdit:
+  # Changes to a set of materials and to the node trees and nested groups they use,
+  # applied in one pass with the old values kept so that they can be reverted.
+  # A change is either ('MATERIAL', attribute, value) or
+  # ('NODE_INPUT', node bl_idname, input name, value)
+
+  def __init__(self, materials):
+    self.materials = materials
+    self.snapshot = []
+    # Every tree once with the key of the datablock it belongs to, groups are
+    # memoized so shared and nested ones are only visited once
+    self.trees = {}
+    stack = [(m.node_tree, ('MATERIAL_TREE', m.name)) for m in materials if m.node_tree]
+    while stack:
+      tree, owner = stack.pop()
+      if tree.session_uid in self.trees: continue
+      self.trees[tree.session_uid] = (tree, owner)
+      for node in tree.nodes:
+        if node.type == 'GROUP' and node.node_tree:
+          stack.append((node.node_tree, ('NODE_GROUP', node.node_tree.name)))
+
+  @staticmethod
+  def owner(key):
+    kind, name = key
+    if kind == 'NODE_GROUP':
+      return bpy.data.node_groups.get(name)
+    material = bpy.data.materials.get(name)
+    return material.node_tree if material and kind == 'MATERIAL_TREE' else material
+
+  @staticmethod
+  def changed(key):
+    # Material hashes are cached by the data version of the material or node group
+    kind, name = key
+    id_data = (bpy.data.node_groups if kind == 'NODE_GROUP' else bpy.data.materials).get(name)
+    if id_data is not None:
+      bump_data_version(id_data)
+
+  def set(self, owner, struct, attribute, value):
+    old_value = getattr(struct, attribute)
+    if _freeze(old_value) == _freeze(value): return
+    old_value = set(old_value) if isinstance(old_value, set) else _freeze(old_value)
+    self.snapshot.append((owner, struct.path_from_id(), attribute, old_value))
+    setattr(struct, attribute, value)
+    self.changed(owner)
+
+  def apply(self, changes):
+    node_changes = {}
+    for change in changes:
+      if change[0] == 'MATERIAL':
+        for material in self.materials:
+          self.set(('MATERIAL', material.name), material, change[1], change[2])
+      elif change[0] == 'NODE_INPUT':
+        node_changes.setdefault(change[1], []).append(change[2:])
+    if not node_changes: return
+    for tree, owner in self.trees.values():
+      for node in tree.nodes:
+        for input_name, value in node_changes.get(node.bl_idname, ()):
+          if input_name in node.inputs:
+            self.set(owner, node.inputs[input_name], 'default_value', value)
+
+  def revert(self):
+    for key, path, attribute, value in reversed(self.snapshot):
+      self.changed(key)
+      owner = self.owner(key)
+      if owner is None: continue
+      try:
+        struct = owner.path_resolve(path) if path else owner
+      except ValueError: continue
+      setattr(struct, attribute, value)
+    self.snapshot.clear()
+
+# The last material edit, kept for reverting
+_material_edits = []
+
+def edit_materials(materials, changes):
+  edit = MaterialEdit(materials)
+  edit.apply(changes)
+  if edit.snapshot:
+    _material_edits[:] = [edit]
+  return edit
+
+class EditMaterialsOperator(bpy.types.Operator):
+  """Change properties of all materials of the selected objects and of the nodes in them, including nested node groups"""
+  bl_idname = 'qm.edit_materials'
+  bl_label = 'Edit Materials'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  changes: bpy.props.StringProperty(name='Changes', description='JSON list of changes like ["MATERIAL", "blend_method", "BLEND"] or ["NODE_INPUT", "ShaderNodeBsdfPrincipled", "Roughness", 0.5]', default='[]')
+
+  @classmethod
+  def poll(cls, context):
+    return len(context.selected_objects) > 0
+
+  def execute(self, context):
+    try:
+      changes = json.loads(self.changes)
+    except json.JSONDecodeError as error:
+      self.report({'ERROR'}, f'Invalid changes: {error}')
+      return {'CANCELLED'}
+    try:
+      edit = edit_materials(unique_materials(context.selected_objects), changes)
+    except (AttributeError, TypeError, ValueError) as error:
+      self.report({'ERROR'}, f'Could not apply changes: {error}')
+      return {'CANCELLED'}
+    self.report({'INFO'}, f'Changed {len(edit.snapshot)} values')
+    return {'FINISHED'}
+
+class RevertMaterialEditOperator(bpy.types.Operator):
+  """Put back the values changed by the last material edit"""
+  bl_idname = 'qm.revert_material_edit'
+  bl_label = 'Revert Material Edit'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  @classmethod
+  def poll(cls, context):
+    return len(_material_edits) > 0
+
+  def execute(self, context):
+    _material_edits.pop().revert()
     return {'FINISHED'}
 
 class ToggleBackfaceCullingOperator(bpy.types.Operator):
@@ -168,20 +766,9 @@ class ToggleBackfaceCullingOperator(bpy.types.Operator):
     return len(bpy.context.selected_objects) > 0
 
   def execute(self, context):
-    some_material_isnt_using_backface_culling = any(
-      not slot.material.use_backface_culling 
-      for obj in bpy.context.selected_objects 
-      for slot in obj.material_slots 
-      if slot.material
-    )
-
-    new_value = some_material_isnt_using_backface_culling
-
-    for obj in bpy.context.selected_objects:
-      for slot in obj.material_slots:
-        if slot.material:
-          slot.material.use_backface_culling = new_value
-
+    materials = unique_materials(context.selected_objects)
+    some_material_isnt_using_backface_culling = any(not m.use_backface_culling for m in materials)
+    edit_materials(materials, [('MATERIAL', 'use_backface_culling', some_material_isnt_using_backface_culling)])
     return {'FINISHED'}
 
 class DisableDisplacementOperator(bpy.types.Operator):
@@ -195,27 +782,42 @@ class DisableDisplacementOperator(bpy.types.Operator):
     return len(bpy.context.selected_objects) > 0
 
   def execute(self, context):
-    for obj in bpy.context.selected_objects:
-      for slot in obj.material_slots:
-        if slot.material and slot.material.node_tree:
-          tree = slot.material.node_tree
-          if 'Displacement' in tree.nodes:
-            tree.nodes['Displacement'].inputs['Scale'].default_value = 0
-
+    # Every displacement node, including the ones in nested node groups
+    edit_materials(unique_materials(context.selected_objects), [('NODE_INPUT', 'ShaderNodeDisplacement', 'Scale', 0)])
     return {'FINISHED'}
 
 def register():
+  bpy.app.handlers.depsgraph_update_post.append(unwrap_on_mode_change)
+  bpy.app.handlers.load_pre.append(clear_pending_unwraps)
   bpy.utils.register_class(StraightenUVsOperator)
   bpy.utils.register_class(MarkSeamOperator)
   bpy.utils.register_class(SmartUVProject)
   bpy.utils.register_class(TransformUVsOperator)
+  bpy.utils.register_class(MeasureTexelDensityOperator)
+  bpy.utils.register_class(SetTexelDensityOperator)
+  bpy.utils.register_class(DeduplicateMaterialsOperator)
+  bpy.utils.register_class(EditMaterialsOperator)
+  bpy.utils.register_class(RevertMaterialEditOperator)
   bpy.utils.register_class(ToggleBackfaceCullingOperator)
   bpy.utils.register_class(DisableDisplacementOperator)
 
 def unregister():
+  if unwrap_on_mode_change in bpy.app.handlers.depsgraph_update_post:
+    bpy.app.handlers.depsgraph_update_post.remove(unwrap_on_mode_change)
+  if clear_pending_unwraps in bpy.app.handlers.load_pre:
+    bpy.app.handlers.load_pre.remove(clear_pending_unwraps)
+  if bpy.app.timers.is_registered(flush_unwraps):
+    bpy.app.timers.unregister(flush_unwraps)
+  _pending_unwraps.clear()
+  _material_edits.clear()
   bpy.utils.unregister_class(StraightenUVsOperator)
   bpy.utils.unregister_class(MarkSeamOperator)
   bpy.utils.unregister_class(SmartUVProject)
   bpy.utils.unregister_class(TransformUVsOperator)
+  bpy.utils.unregister_class(MeasureTexelDensityOperator)
+  bpy.utils.unregister_class(SetTexelDensityOperator)
+  bpy.utils.unregister_class(DeduplicateMaterialsOperator)
+  bpy.utils.unregister_class(EditMaterialsOperator)
+  bpy.utils.unregister_class(RevertMaterialEditOperator)
   bpy.utils.unregister_class(ToggleBackfaceCullingOperator)
   bpy.utils.unregister_class(DisableDisplacementOperator)
\ No newline at end of file
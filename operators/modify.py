@@ -113,14 +113,37 @@ class TriangulateOperator(bpy.types.Operator):
       t.min_vertices = 5
     return {'FINISHED'}
 
+class ApplyModifiersOperator(bpy.types.Operator):
+  """Apply the modifiers added by Quick Menu to all selected objects"""
+  bl_idname = 'qm.apply_modifiers'
+  bl_label = 'Apply Quick Menu Modifiers'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  @classmethod
+  def poll(cls, context):
+    return len(context.selected_objects) > 0
+
+  def execute(self, context):
+    objects = [o for o in context.selected_objects if o.type == 'MESH']
+    apply = lambda: apply_modifiers(objects)
+    count = execute_in_object_mode(apply) if is_in_editmode() else apply()
+    skipped = [o.name for o in objects if o.data.shape_keys and any(is_quick_menu_modifier(m) for m in o.modifiers)]
+    if skipped:
+      self.report({'WARNING'}, f'Skipped objects with shape keys: {", ".join(skipped)}')
+    else:
+      self.report({'INFO'}, f'Applied modifiers to {count} meshes')
+    return {'FINISHED'}
+
 def register():
   bpy.utils.register_class(ConvertToMeshOperator)
   bpy.utils.register_class(SubsurfOperator)
   bpy.utils.register_class(BevelOperator)
   bpy.utils.register_class(TriangulateOperator)
+  bpy.utils.register_class(ApplyModifiersOperator)
 
 def unregister():
   bpy.utils.unregister_class(ConvertToMeshOperator)
   bpy.utils.unregister_class(SubsurfOperator)
   bpy.utils.unregister_class(BevelOperator)
-  bpy.utils.unregister_class(TriangulateOperator)
\ No newline at end of file
+  bpy.utils.unregister_class(TriangulateOperator)
+  bpy.utils.unregister_class(ApplyModifiersOperator)
\ No newline at end of file
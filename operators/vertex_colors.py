@@ -1,5 +1,7 @@
-import bpy
+import bpy, time
+import numpy as np
 from mathutils import Color
+from mathutils.bvhtree import BVHTree
 
 from .. common.common import *
 
@@ -16,6 +18,260 @@ colors = [
     (163, 240, 173),
 ]
 
+# Minimum CIE76 distance between generated colors and colors already in use
+MIN_COLOR_DISTANCE = 10
+
+# Generator candidates rejected in a row before the minimum distance is halved
+MAX_COLOR_ATTEMPTS = 256
+
+# Generator candidates checked at a time for every color still needed
+CANDIDATES_PER_COLOR = 4
+
+# Below this distance candidates only have to differ from used colors
+MIN_RELAXED_DISTANCE = 0.5
+
+# Number of 8 bit RGB colors, and an odd stride that visits all of them in a scattered order
+KEY_COUNT = 1 << 24
+KEY_STRIDE = 0x9E3779
+
+# Offsets of a Lab cell and its 26 neighbours
+CELL_OFFSETS = np.array([(l, a, b) for l in (-1, 0, 1) for a in (-1, 0, 1) for b in (-1, 0, 1)])
+
+# Steps of the R2 low discrepancy sequence in three dimensions (powers of the
+# inverse plastic number), spreads generated colors evenly over the RGB cube
+R2_STEPS = 1 / 1.2207440846057596 ** np.arange(1, 4)
+
+def colors_by_index(start, count):
+  # Palette colors first, then points of the R2 sequence, which reach every
+  # region of the 24 bit color space instead of a few hue rings
+  indices = np.arange(start, start + count)
+  result = np.empty((count, 3))
+  preset = indices < len(colors)
+  result[preset] = np.array(colors, dtype=np.float64)[indices[preset]] / 255
+  result[~preset] = (0.5 + (indices[~preset, None] - len(colors)) * R2_STEPS) % 1
+  return result
+
+def color_by_index(i):
+  return tuple(colors_by_index(i, 1)[0].tolist())
+
+def color_keys_8bit(rgb):
+  rgb = np.round(np.clip(np.asarray(rgb, dtype=np.float64).reshape(-1, 3), 0, 1) * 255).astype(np.int64)
+  return (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+
+def srgb_to_lab(rgb):
+  rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3)
+  linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+  xyz = linear @ np.array((
+    (0.4124, 0.3576, 0.1805),
+    (0.2126, 0.7152, 0.0722),
+    (0.0193, 0.1192, 0.9505),
+  )).T / (0.95047, 1, 1.08883)
+  f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16 / 116)
+  return np.stack((116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])), axis=1)
+
+class UsedColorIndex:
+  # Colors used by color attributes of all meshes. Every used color sits in a
+  # grid of Lab cells as big as the current minimum distance, so checking a
+  # candidate only looks at its 27 neighbouring cells. The distance stays
+  # relaxed across calls until colors stop being used. Meshes are rescanned
+  # only when their data version changes
+
+  def __init__(self):
+    self.meshes = {}    # mesh session uid -> (data version, used color keys)
+    self.pending = []   # keys handed out since the last refresh
+    self.counts = {}    # color key -> number of users
+    self.labs = {}      # color key -> Lab color
+    self.cells = {}     # Lab cell -> {color key: Lab color}
+    self.key_cells = {} # color key -> Lab cell
+    self.distance = MIN_COLOR_DISTANCE
+    self.relaxed_at = 0 # number of used colors when the distance was last relaxed
+    self.key_cursor = 0 # position of the walk through all 8 bit keys
+
+  def _cells(self, labs):
+    return [tuple(cell) for cell in np.floor(labs / self.distance).astype(np.int64).tolist()]
+
+  def _add(self, keys):
+    new = [key for key in keys.tolist() if key not in self.counts]
+    for key in keys.tolist():
+      self.counts[key] = self.counts.get(key, 0) + 1
+    if not new: return
+    new = np.array(new, dtype=np.int64)
+    rgb = np.stack(((new >> 16) & 255, (new >> 8) & 255, new & 255), axis=1) / 255
+    labs = srgb_to_lab(rgb)
+    for key, lab, cell in zip(new.tolist(), labs, self._cells(labs)):
+      self.labs[key] = lab
+      self.cells.setdefault(cell, {})[key] = lab
+      self.key_cells[key] = cell
+
+  def _remove(self, keys):
+    for key in keys.tolist():
+      self.counts[key] -= 1
+      if self.counts[key] > 0: continue
+      del self.counts[key]
+      del self.labs[key]
+      cell = self.key_cells.pop(key)
+      del self.cells[cell][key]
+      if not self.cells[cell]: del self.cells[cell]
+
+  def _set_distance(self, distance):
+    # Regrid the used colors so cells stay as big as the distance
+    self.distance = distance
+    self.cells.clear()
+    self.key_cells.clear()
+    if not self.labs: return
+    keys = list(self.labs)
+    labs = np.array(list(self.labs.values()))
+    for key, lab, cell in zip(keys, labs, self._cells(labs)):
+      self.cells.setdefault(cell, {})[key] = lab
+      self.key_cells[key] = cell
+
+  def refresh(self):
+    if self.pending:
+      self._remove(np.array(self.pending, dtype=np.int64))
+      self.pending.clear()
+    seen = set()
+    for obj in bpy.data.objects:
+      if obj.type != 'MESH' or obj.data.session_uid in seen: continue
+      mesh = obj.data
+      seen.add(mesh.session_uid)
+      version = data_version(mesh)
+      cached = self.meshes.get(mesh.session_uid)
+      if cached and cached[0] == version: continue
+      if cached: self._remove(cached[1])
+      keys = self.scan(obj)
+      self._add(keys)
+      self.meshes[mesh.session_uid] = (version, keys)
+    for uid in [uid for uid in self.meshes if uid not in seen]:
+      self._remove(self.meshes.pop(uid)[1])
+    # Go back to the full distance once the colors that crowded it are gone
+    if self.distance < MIN_COLOR_DISTANCE and len(self.labs) < self.relaxed_at:
+      self.relaxed_at = 0
+      self._set_distance(MIN_COLOR_DISTANCE)
+
+  def scan(self, obj):
+    keys = [np.empty(0, dtype=np.int64)]
+    if len(obj.data.color_attributes):
+      with MeshAccess(obj) as access:
+        for attribute in obj.data.color_attributes:
+          values = access.colors(attribute.name)
+          if values is not None and len(values):
+            keys.append(np.unique(color_keys_8bit(from_stored_color(values, attribute)[:, :3])))
+    return np.unique(np.concatenate(keys))
+
+  def distinct(self, keys, labs):
+    # Mask of the candidates that are unused and far enough from every used color
+    mask = np.array([key not in self.counts for key in keys.tolist()], dtype=bool)
+    if self.distance < MIN_RELAXED_DISTANCE or not self.cells: return mask
+    cells, inverse = np.unique(np.floor(labs / self.distance).astype(np.int64), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    for i, cell in enumerate(cells):
+      neighbours = [self.cells.get(tuple(c)) for c in (cell + CELL_OFFSETS).tolist()]
+      used = [lab for n in neighbours if n for lab in n.values()]
+      if not used: continue
+      members = np.flatnonzero(inverse == i)
+      distances = np.linalg.norm(labs[members, None] - np.array(used)[None], axis=2)
+      mask[members] &= distances.min(axis=1) >= self.distance
+    return mask
+
+  def next_colors(self, index, count):
+    # The next count generator colors from index on that are distinct from
+    # every used color and from each other, with the index after the last one.
+    # Once the distance is fully relaxed, unused 8 bit colors are taken instead
+    chosen, misses = [], 0
+    while len(chosen) < count:
+      batch = min(MAX_COLOR_ATTEMPTS, (count - len(chosen)) * CANDIDATES_PER_COLOR)
+      candidates = colors_by_index(index, batch)
+      keys = color_keys_8bit(candidates)
+      labs = srgb_to_lab(candidates)
+      # Candidates chosen from this batch aren't in the grid yet
+      accepted = []
+      for i in np.flatnonzero(self.distinct(keys, labs)).tolist():
+        if accepted and np.linalg.norm(labs[accepted] - labs[i], axis=1).min() < self.distance: continue
+        accepted.append(i)
+        if len(chosen) + len(accepted) == count: break
+      if accepted:
+        index += accepted[-1] + 1 if len(chosen) + len(accepted) == count else batch
+        misses = 0
+      elif self.distance >= MIN_RELAXED_DISTANCE:
+        index += batch
+        misses += batch
+        if misses >= MAX_COLOR_ATTEMPTS:
+          # Nothing fits at this distance, relax it for this and later calls
+          self.relaxed_at = len(self.labs)
+          self._set_distance(self.distance / 2)
+          index -= misses
+          misses = 0
+        continue
+      else:
+        # The generator only gives used colors, take unused ones from the whole key space
+        keys = self.unused_keys(count - len(chosen))
+        candidates = np.stack(((keys >> 16) & 255, (keys >> 8) & 255, keys & 255), axis=1) / 255
+        accepted = np.arange(len(keys))
+      chosen.extend(candidates[accepted].tolist())
+      self.pending.extend(keys[accepted].tolist())
+      self._add(keys[accepted])
+    return chosen, index
+
+  def unused_keys(self, count):
+    # The next count 8 bit keys of the scattered walk that nothing uses
+    if len(self.counts) + count > KEY_COUNT:
+      raise RuntimeError('Every 8 bit color is already in use')
+    found = {}
+    while len(found) < count:
+      steps = np.arange(self.key_cursor, self.key_cursor + max(count * 2, MAX_COLOR_ATTEMPTS))
+      self.key_cursor = (self.key_cursor + len(steps)) % KEY_COUNT
+      for key in ((steps * KEY_STRIDE) % KEY_COUNT).tolist():
+        if key in self.counts or key in found: continue
+        found[key] = None
+        if len(found) == count: break
+    return np.array(list(found), dtype=np.int64)
+
+used_colors = UsedColorIndex()
+
+# Colors in this module are handled the way byte color attributes store them
+# (sRGB encoded), float color attributes store linear values
+def to_stored_color(color, attribute):
+  color = np.array(color, dtype=np.float32)
+  if attribute.data_type == 'FLOAT_COLOR':
+    rgb = color[..., :3]
+    color[..., :3] = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+  return color
+
+def from_stored_color(color, attribute):
+  color = np.array(color, dtype=np.float32)
+  if attribute.data_type == 'FLOAT_COLOR':
+    rgb = np.clip(color[..., :3], 0, None)
+    color[..., :3] = np.where(rgb <= 0.0031308, rgb * 12.92, 1.055 * rgb ** (1 / 2.4) - 0.055)
+  return color
+
+def element_indices(access, attribute, loop_indices):
+  # Indices into the attribute's domain for a set of loops
+  if attribute.domain == 'POINT':
+    return np.unique(access.loop_vertices()[loop_indices])
+  return loop_indices
+
+def get_active_color(obj):
+  attribute = obj.data.color_attributes.active_color
+  if attribute is None:
+    return (1, 1, 1)
+  with MeshAccess(obj) as access:
+    _, active_indeces = selected_and_active_loops(access)
+    if len(active_indeces) == 0:
+      return (1, 1, 1)
+    index = element_indices(access, attribute, active_indeces[:1])[0]
+    return tuple(from_stored_color(access.colors(attribute.name)[index][:3], attribute).tolist())
+
+def set_color(obj, color):
+  # Set the color of the selected faces in the object's active color attribute
+  attribute = ensure_color_attribute(obj.data)
+  with MeshAccess(obj) as access:
+    selection_indeces, _ = selected_and_active_loops(access)
+    if len(selection_indeces) == 0:
+      return
+    indices = element_indices(access, attribute, selection_indeces)
+    value = to_stored_color((*color, 1), attribute)
+    access.set_colors(np.broadcast_to(value, (len(indices), 4)), indices, attribute.name)
+
 class SetVertexColorOperator(bpy.types.Operator):
   """Set Vertex Color"""
   bl_idname = 'qm.set_vertex_color'
@@ -28,6 +284,8 @@ class SetVertexColorOperator(bpy.types.Operator):
 
   reset_index: bpy.props.BoolProperty(name='Reset Index', default = False)
 
+  avoid_used: bpy.props.BoolProperty(name='Avoid Used Colors', default = True)
+
   @classmethod
   def poll(cls, context):
     return is_in_editmode()
@@ -46,17 +304,16 @@ class SetVertexColorOperator(bpy.types.Operator):
     # Generate next unique RGB
     if not self.set_to_active and not self.options.is_repeat:
       i = context.scene.quick_menu.vertex_color_index
-
-      # If index is in colors range, use it
-      if i < len(colors):
-        values = tuple([c / 255 for c in colors[i]])
-      # Else pick next unique one
+      if self.avoid_used:
+        used_colors.refresh()
+        try:
+          (values,), next_index = used_colors.next_colors(i, 1)
+        except RuntimeError as error:
+          self.report({'ERROR'}, str(error))
+          return {'CANCELLED'}
+        i = next_index - 1
       else:
-        values = (
-          1 - (i * 3 % 10) / 10,
-          1 - ((i * 3 // 10) % 10) / 10,
-          1 - ((i * 3 // 10) % 10) / 10
-        )
+        values = color_by_index(i)
       next_color = Color()
       next_color.r = values[0]
       next_color.g = values[1]
@@ -64,71 +321,315 @@ class SetVertexColorOperator(bpy.types.Operator):
 
       self.report({'INFO'}, 'Vertex Color Index: ' + str(i))
 
-      context.scene.quick_menu.vertex_color_index += 1
+      context.scene.quick_menu.vertex_color_index = i + 1
+
+    # Take the color from the active face of the active object so that we can copy between meshes:
+    if self.set_to_active:
+      self.color = get_active_color(context.active_object)
+    elif not self.options.is_repeat:
+      self.color = next_color
 
-    # Track if we already set color from active so that we can copy between meshes:
-    initial_active = context.active_object
     for obj in context.objects_in_mode:
-      mesh = obj.data
-      context.view_layer.objects.active = obj
-      selection_indeces, active_indeces = execute_in_edit_mode(get_selection_and_active_indices)
-      def assign_colors():
-        # Set color to the next random color:
-        if self.set_to_active:
-          if obj == initial_active:
-            if len(active_indeces) > 0 and mesh.vertex_colors.active:
-              self.color = list(mesh.vertex_colors.active.data[active_indeces[0]].color)[:3]
-            else: self.color = (1, 1, 1)
-        elif not self.options.is_repeat:
-          self.color = next_color
-        # Set the color of selection
-        for index in selection_indeces:
-          mesh.vertex_colors.active.data[index].color = (self.color[0], self.color[1], self.color[2], 1)
-      execute_in_object_mode(assign_colors)
+      if obj.type == 'MESH':
+        set_color(obj, self.color)
     return {'FINISHED'}
 
+def color_grid_size(step):
+  return int(np.ceil(1 / step)) + 3
+
+def color_keys(colors, step):
+  # Quantize RGB to integer grid cells of the given size, packed into one int64 key
+  cells = color_grid_size(step)
+  quantized = np.clip(np.round(np.asarray(colors)[:, :3] / step).astype(np.int64), -1, cells - 2) + 1
+  return (quantized[:, 0] * cells + quantized[:, 1]) * cells + quantized[:, 2]
+
+def loop_color_keys(access, step):
+  # Color key of every loop of a mesh, or None if it has no color attribute
+  attribute = access.color_attribute()
+  if attribute is None:
+    return None
+  keys = color_keys(from_stored_color(access.colors(attribute.name), attribute), step)
+  return keys[access.loop_vertices()] if attribute.domain == 'POINT' else keys
+
 class SelectByVertexColorOperator(bpy.types.Operator):
   """Select By Vertex Color"""
   bl_idname = 'qm.select_by_vertex_color'
   bl_label = 'Select By Vertex Color'
   bl_options = {'REGISTER', 'UNDO'}
 
+  tolerance: bpy.props.FloatProperty(name='Tolerance', default=0, min=0, max=1, step=0.1)
+
   @classmethod
   def poll(cls, context):
     return is_in_editmode()
 
   def execute(self, context):
     context.space_data.shading.color_type = 'VERTEX'
-    selected_colors = []
-    # Gather all of the selected colors across all of the objects first
-    for obj in context.objects_in_mode:
-      context.view_layer.objects.active = obj
-      selection_indeces, _ = execute_in_edit_mode(get_selection_and_active_indices)
-      def fn():
-        for index in selection_indeces:
-          selected_colors.append(obj.data.vertex_colors.active.data[index].color)
-      execute_in_object_mode(fn)
-    # Set selection
+    # Without tolerance colors match when they're equal in 8 bits, with it
+    # colors in neighbouring tolerance-sized cells match as well
+    step = self.tolerance if self.tolerance > 0 else 1 / 255
+    cells = color_grid_size(step)
+    if self.tolerance > 0:
+      offsets = [(r * cells + g) * cells + b for r in (-1, 0, 1) for g in (-1, 0, 1) for b in (-1, 0, 1)]
+    else:
+      offsets = [0]
+
+    meshes = []
+    selected_keys = []
+    try:
+      # Gather all of the selected colors across all of the objects first
+      for obj in context.objects_in_mode:
+        if obj.type != 'MESH': continue
+        access = MeshAccess(obj)
+        keys = loop_color_keys(access, step)
+        meshes.append((access, keys))
+        if keys is None: continue
+        selection_indeces, _ = selected_and_active_loops(access)
+        selected_keys.append(keys[selection_indeces])
+
+      if not selected_keys:
+        return {'FINISHED'}
+      selected_keys = np.unique(np.concatenate(selected_keys))
+
+      # Set selection
+      for access, keys in meshes:
+        if keys is None: continue
+        loop_matches = np.zeros(len(keys), dtype=bool)
+        for offset in offsets:
+          loop_matches |= np.isin(keys + offset, selected_keys)
+        starts = access.loop_starts()
+        if len(starts) == 0: continue
+        face_matches = np.logical_or.reduceat(loop_matches, starts)
+        access.set_face_selection(face_matches & ~access.face_hidden())
+    finally:
+      for access, _ in meshes:
+        access.release()
+    return {'FINISHED'}
+
+class AssignIslandColorsOperator(bpy.types.Operator):
+  """Assign a unique vertex color to every island of the selected faces (or of the whole mesh if nothing is selected)"""
+  bl_idname = 'qm.assign_island_colors'
+  bl_label = 'Assign Island Colors'
+  bl_options = {'REGISTER', 'UNDO'}
+
+  delimit_seams: bpy.props.BoolProperty(name='Split By Seams', default=False)
+
+  delimit_material: bpy.props.BoolProperty(name='Split By Material', default=False)
+
+  reset_index: bpy.props.BoolProperty(name='Reset Index', default=False)
+
+  avoid_used: bpy.props.BoolProperty(name='Avoid Used Colors', default=True)
+
+  @classmethod
+  def poll(cls, context):
+    return is_in_editmode()
+
+  def invoke(self, context, event):
+    if event.shift: self.reset_index = True
+    return self.execute(context)
+
+  def execute(self, context):
+    context.space_data.shading.color_type = 'VERTEX'
+    properties = context.scene.quick_menu
+    if self.reset_index:
+      properties.vertex_color_index = 0
+    index = properties.vertex_color_index
+    island_count = 0
+    keys = []
+    if self.avoid_used:
+      used_colors.refresh()
+
     for obj in context.objects_in_mode:
-      mesh = obj.data
-      context.view_layer.objects.active = obj
-      selection_indeces, _ = execute_in_edit_mode(get_selection_and_active_indices)
-      def fn():
-        for poly in mesh.polygons:
-          poly.select = False
-          for index in poly.loop_indices:
-            c = mesh.vertex_colors.active.data[index].color
-            for sc in selected_colors:
-              if c[0] == sc[0] and c[1] == sc[1] and c[2] == sc[2]:
-                poly.select = True
-                continue
-      execute_in_object_mode(fn)
+      if obj.type != 'MESH': continue
+      attribute = ensure_color_attribute(obj.data)
+      with MeshAccess(obj) as access:
+        selected = access.face_selection() & ~access.face_hidden()
+        faces = np.flatnonzero(selected if selected.any() else ~access.face_hidden())
+        if len(faces) == 0: continue
+        labels = mesh_islands(access, faces, self.delimit_seams, self.delimit_material)
+        count = labels.max() + 1
+        if self.avoid_used:
+          try:
+            palette, index = used_colors.next_colors(index, count)
+          except RuntimeError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+        else:
+          palette = colors_by_index(index, count)
+          index += count
+        keys.append(color_keys_8bit(palette))
+        palette = to_stored_color([(*color, 1) for color in palette], attribute)
+        island_count += count
+
+        # One write of every loop (or point) of the islands
+        totals = access.loop_totals()
+        loops = face_loop_indices(access.loop_starts(), totals, faces)
+        loop_colors = palette[np.repeat(labels, totals[faces])]
+        if attribute.domain == 'POINT':
+          loops_vertices = access.loop_vertices()[loops]
+          indices, first = np.unique(loops_vertices, return_index=True)
+          access.set_colors(loop_colors[first], indices, attribute.name)
+        else:
+          access.set_colors(loop_colors, loops, attribute.name)
+
+    properties.vertex_color_index = index
+    repeated = island_count - len(np.unique(np.concatenate(keys))) if keys else 0
+    if repeated:
+      self.report({'WARNING'}, f'Islands: {island_count}, {repeated} of them share a color with another island')
+    else:
+      self.report({'INFO'}, f'Islands: {island_count}')
+    return {'FINISHED'}
+
+# Seconds of ray casting per timer tick, so the UI stays responsive while baking
+AO_TIME_SLICE = 0.05
+
+def hemisphere_directions(samples):
+  # Cosine weighted directions around +Z on a Fibonacci spiral
+  k = np.arange(samples) + 0.5
+  radius = np.sqrt(k / samples)
+  angle = k * np.pi * (3 - np.sqrt(5))
+  return np.stack((radius * np.cos(angle), radius * np.sin(angle), np.sqrt(1 - k / samples)), axis=1)
+
+class VertexAOBake:
+  # Ambient occlusion of one mesh against itself, cast a slice of vertices at a time
+
+  def __init__(self, obj, samples, distance, attribute_name):
+    self.object_name = obj.name
+    self.attribute_name = attribute_name
+    self.distance = distance
+    with MeshAccess(obj) as access:
+      positions = access.vertex_positions()
+      self.normals = access.vertex_normals()
+      starts = access.loop_starts()
+      polygons = [p.tolist() for p in np.split(access.loop_vertices(), starts[1:])] if len(starts) else []
+    self.tree = BVHTree.FromPolygons(positions.tolist(), polygons)
+    self.origins = positions + self.normals * (distance * 1e-3)
+    self.directions = hemisphere_directions(samples)
+    self.occlusion = np.zeros(len(positions), dtype=np.float32)
+    self.next = 0
+
+  @property
+  def total(self):
+    return len(self.occlusion)
+
+  @property
+  def done(self):
+    return self.next >= self.total
+
+  def step(self, count):
+    start, end = self.next, min(self.next + count, self.total)
+    normals = self.normals[start:end]
+    # Orthonormal basis around every normal, then all of the slice's ray directions at once
+    helper = np.where(np.abs(normals[:, 2:3]) < 0.999, (0, 0, 1), (1, 0, 0))
+    tangents = np.cross(helper, normals)
+    tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+    bitangents = np.cross(normals, tangents)
+    x, y, z = self.directions.T
+    directions = x[None, :, None] * tangents[:, None] + y[None, :, None] * bitangents[:, None] + z[None, :, None] * normals[:, None]
+    ray_cast, distance = self.tree.ray_cast, self.distance
+    hits = [
+      sum(ray_cast(origin, direction, distance)[0] is not None for direction in vertex_directions)
+      for origin, vertex_directions in zip(self.origins[start:end].tolist(), directions.tolist())
+    ]
+    self.occlusion[start:end] = np.array(hits, dtype=np.float32) / len(self.directions)
+    self.next = end
+
+  def write(self):
+    # AO is written as is, without color space conversion, the way game engines read it
+    obj = bpy.data.objects.get(self.object_name)
+    if obj is None or obj.type != 'MESH':
+      return
+    ao = 1 - self.occlusion
+    colors = np.stack((ao, ao, ao, np.ones_like(ao)), axis=1)
+    with MeshAccess(obj) as access:
+      # Skip meshes whose topology changed while baking
+      if len(access.source.vertices) != self.total:
+        return
+      if self.attribute_name not in obj.data.color_attributes:
+        obj.data.color_attributes.new(self.attribute_name, 'BYTE_COLOR', 'POINT')
+      if access.color_attribute(self.attribute_name).domain == 'CORNER':
+        colors = colors[access.loop_vertices()]
+      access.set_colors(colors, None, self.attribute_name)
+
+_ao_bakes = []
+
+def ao_bake_progress():
+  return sum(bake.next for bake in _ao_bakes), sum(bake.total for bake in _ao_bakes)
+
+def _finish_ao_bakes(write):
+  if write:
+    for bake in _ao_bakes: bake.write()
+  _ao_bakes.clear()
+  if not bpy.app.background:
+    bpy.context.window_manager.progress_end()
+    if write:
+      try: bpy.ops.ed.undo_push(message='Bake Vertex AO')
+      except: pass
+
+def _ao_bake_tick():
+  if not _ao_bakes:
+    return None
+  deadline = time.perf_counter() + AO_TIME_SLICE
+  for bake in _ao_bakes:
+    while not bake.done and time.perf_counter() < deadline:
+      bake.step(64)
+  done, total = ao_bake_progress()
+  bpy.context.window_manager.progress_update(done)
+  if done < total:
+    return 0.01
+  _finish_ao_bakes(True)
+  return None
+
+class BakeVertexAOOperator(bpy.types.Operator):
+  """Bake ambient occlusion into a color attribute of the selected meshes. Run again while baking to cancel"""
+  bl_idname = 'qm.bake_vertex_ao'
+  bl_label = 'Bake Vertex AO'
+  bl_options = {'REGISTER'}
+
+  samples: bpy.props.IntProperty(name='Samples', default=32, min=1, soft_max=256)
+
+  distance: bpy.props.FloatProperty(name='Distance', default=1, min=0.0001, subtype='DISTANCE')
+
+  attribute: bpy.props.StringProperty(name='Attribute', default='AO')
+
+  def execute(self, context):
+    if _ao_bakes:
+      if bpy.app.timers.is_registered(_ao_bake_tick):
+        bpy.app.timers.unregister(_ao_bake_tick)
+      _finish_ao_bakes(False)
+      self.report({'INFO'}, 'Vertex AO bake cancelled')
+      return {'CANCELLED'}
+
+    objects = context.objects_in_mode if is_in_editmode() else context.selected_objects
+    for obj in objects:
+      if obj.type == 'MESH':
+        _ao_bakes.append(VertexAOBake(obj, self.samples, self.distance, self.attribute))
+    if not _ao_bakes:
+      return {'CANCELLED'}
+
+    # Without a UI there are no timers to run on, bake right away
+    if bpy.app.background:
+      for bake in _ao_bakes:
+        while not bake.done: bake.step(1024)
+      _finish_ao_bakes(True)
+      return {'FINISHED'}
+
+    context.window_manager.progress_begin(0, ao_bake_progress()[1])
+    bpy.app.timers.register(_ao_bake_tick)
+    self.report({'INFO'}, 'Baking vertex AO, run again to cancel')
     return {'FINISHED'}
 
 def register():
   bpy.utils.register_class(SetVertexColorOperator)
   bpy.utils.register_class(SelectByVertexColorOperator)
+  bpy.utils.register_class(AssignIslandColorsOperator)
+  bpy.utils.register_class(BakeVertexAOOperator)
 
 def unregister():
+  if bpy.app.timers.is_registered(_ao_bake_tick):
+    bpy.app.timers.unregister(_ao_bake_tick)
+  _ao_bakes.clear()
   bpy.utils.unregister_class(SetVertexColorOperator)
-  bpy.utils.unregister_class(SelectByVertexColorOperator)
\ No newline at end of file
+  bpy.utils.unregister_class(SelectByVertexColorOperator)
+  bpy.utils.unregister_class(AssignIslandColorsOperator)
+  bpy.utils.unregister_class(BakeVertexAOOperator)
\ No newline at end of file